@@ -0,0 +1,71 @@
+"""
+Timings of the condition and count batch selectors.
+
+Run from the directory containing the package:
+    python -m <package>.benchmarks.bench_batch_selectors
+"""
+
+import timeit
+
+import numpy as np
+
+from ..generators.batch_selectors import (
+    make_batch_selector_cond_count,
+    select_batches_cond_count_array
+)
+
+
+def consume_batches(batches) -> int:
+    """
+    Exhausts a generator of batches.
+
+    Parameters:
+        batches: Generator : batches!
+
+    Returns:
+        n_element: int : number of elements in the batches
+    """
+
+    return sum(len(list(batch)) for batch in batches)
+
+
+def run(n_element: int = 1_000_000, repeat: int = 3) -> None:
+    """
+    Times the iterator and array selectors for increasing batch sizes.
+
+    Parameters:
+        n_element: int : length of the input stream
+        repeat: int : number of timing repetitions, the best one is kept
+
+    Returns:
+        None : prints the timings to stdout
+    """
+
+    array = np.arange(n_element)
+
+    print(f"{'n':>8} {'iterator [s]':>14} {'array [s]':>12}")
+    for n in (10, 100, 1_000, 10_000, 100_000):
+
+        # a batch starts at every (2n)-th element
+        period = 2 * n
+
+        t_iter = min(timeit.repeat(
+            lambda: consume_batches(make_batch_selector_cond_count(
+                iter(range(n_element)), lambda x: x % period == 0, n, True
+            )),
+            number=1, repeat=repeat
+        ))
+
+        t_array = min(timeit.repeat(
+            # array batches are views => their length is known
+            lambda: sum(map(len, select_batches_cond_count_array(
+                array, lambda x: x % period == 0, n, True
+            ))),
+            number=1, repeat=repeat
+        ))
+
+        print(f"{n:>8} {t_iter:>14.4f} {t_array:>12.4f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,70 @@
+"""
+Import time of the package and check that numpy is not loaded by it.
+
+Run from the directory containing the package:
+    python -m <package>.benchmarks.bench_import_time
+"""
+
+import subprocess
+import sys
+
+from typing import (
+    Dict
+)
+
+
+def measure_import_time(module: str) -> Dict[str, int]:
+    """
+    Imports a module in a fresh interpreter with `-X importtime`.
+
+    Parameters:
+        module: str : dotted name of the module
+
+    Returns:
+        timings: Dict[str, int] : cumulative import time in microseconds
+            of each module imported
+    """
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True
+    )
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        try:
+            timings[fields[2].strip()] = int(fields[1])
+        except ValueError:
+            # header line
+            continue
+
+    return timings
+
+
+def run() -> None:
+    """
+    Prints the import time of the public packages.
+
+    Parameters:
+        None
+
+    Returns:
+        None : prints the timings to stdout
+    """
+
+    package = __package__.split(".")[0]
+
+    for subpackage in ("generators", "coroutines", "util"):
+        module = f"{package}.{subpackage}"
+        timings = measure_import_time(module)
+        print(
+            f"{module:>20} {timings.get(module, 0):>8} us"
+            f"  numpy loaded: {'numpy' in timings}"
+        )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,75 @@
+"""
+Timings of curried predicates called per element and on arrays.
+
+Run from the directory containing the package:
+    python -m <package>.benchmarks.bench_predicates
+"""
+
+import operator
+import timeit
+
+import numpy as np
+
+from ..generators.basic import (
+    filtr
+)
+
+from ..util.func_helper import (
+    curry_2arg,
+    vectorise_predicate
+)
+
+
+def closure_2arg(func, arg):
+    """
+    Curries a binary function with a python closure
+    i.e. the generic fallback of `curry_2arg`.
+
+    Parameters:
+        func: Callable : binary function
+        arg: Any : the second argument of the function
+
+    Returns:
+        inner: Callable : function with its 1st argument only
+    """
+
+    def inner(x):
+        return func(x, arg)
+    return inner
+
+
+def run(n_element: int = 1_000_000, repeat: int = 3) -> None:
+    """
+    Times `filtr` with closure and operator predicates
+    and the vectorised operator predicate.
+
+    Parameters:
+        n_element: int : length of the input stream
+        repeat: int : number of timing repetitions, the best one is kept
+
+    Returns:
+        None : prints the timings to stdout
+    """
+
+    array = np.arange(n_element)
+    threshold = n_element // 2
+
+    cases = {
+        "filtr closure": lambda: sum(1 for _ in filtr(
+            iter(range(n_element)), closure_2arg(operator.gt, threshold)
+        )),
+        "filtr curry_2arg": lambda: sum(1 for _ in filtr(
+            iter(range(n_element)), curry_2arg(operator.gt, threshold)
+        )),
+        "vectorised": lambda: int(np.count_nonzero(
+            vectorise_predicate(curry_2arg(operator.gt, threshold))(array)
+        ))
+    }
+
+    for name, func in cases.items():
+        t = min(timeit.repeat(func, number=1, repeat=repeat))
+        print(f"{name:>20} {t:>10.4f} s")
+
+
+if __name__ == "__main__":
+    run()
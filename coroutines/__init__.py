@@ -0,0 +1,19 @@
+"""
+Coroutine pipelines.
+"""
+
+from .multiplexer_coro import (
+    collector_coro,
+    filter_coro,
+    multiplex_coro,
+    start_coro
+)
+
+from .file_coro import (
+    line_writer_coro,
+    record_writer_coro
+)
+
+from .sketch_coro import (
+    sketch_coro
+)
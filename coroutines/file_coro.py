@@ -0,0 +1,80 @@
+"""
+File backed sinks of the coroutine pipelines.
+"""
+
+from typing import (
+    Any,
+    Generator
+)
+
+from .multiplexer_coro import (
+    start_coro
+)
+
+
+@start_coro
+def record_writer_coro(path: str, mode: str = "wb") -> Generator:
+    """
+    Writes sent batches of fixed width records to a binary file.
+    Anything exporting a contiguous buffer is written without
+    a copy, e.g. numpy arrays, memmap slices and memoryviews.
+
+    Parameters:
+        path: str : path to the record file
+        mode: str = "wb" : file mode, "ab" to append
+
+    Returns:
+        None : writes the batches to the file
+    """
+
+    with open(path, mode) as fp:
+        while True:
+            batch = (yield)
+            fp.write(batch)
+
+
+@start_coro
+def line_writer_coro(
+        path: str,
+        encoding: str = None,
+        block_size: int = 1 << 20,
+        mode: str = "wb"
+    ) -> Generator:
+    """
+    Writes sent lines to a newline delimited file in large blocks.
+
+    Parameters:
+        path: str : path to the file
+        encoding: str = None : encoding of str lines, bytes are written as is
+        block_size: int = 1 << 20 : number of bytes buffered before writing
+        mode: str = "wb" : file mode, "ab" to append
+
+    Returns:
+        None : writes the lines to the file
+    """
+
+    buffer = []
+    n_byte = 0
+
+    with open(path, mode) as fp:
+        try:
+            while True:
+                line: Any = (yield)
+
+                if encoding is not None:
+                    line = line.encode(encoding)
+
+                buffer.append(line)
+                n_byte += len(line) + 1
+
+                if n_byte >= block_size:
+                    buffer.append(b"")
+                    fp.write(b"\n".join(buffer))
+                    buffer = []
+                    n_byte = 0
+
+        finally:
+            # flush the partial block on `close()`
+            if buffer:
+                buffer.append(b"")
+                fp.write(b"\n".join(buffer))
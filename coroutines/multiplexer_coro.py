@@ -41,30 +41,61 @@ def start_coro(func: Callable) -> Callable:
     return starter
 
 @start_coro
-def multiplex_coro(targets: List[Callable]) -> Generator:
+def multiplex_coro(
+        targets: List[Callable],
+        close_targets: bool = False
+    ) -> Generator:
     """
-    Sends an element to multiple coroutines.
+    Sends an element to multiple coroutines. Targets appended to the
+    list later receive the subsequent elements. Closed targets are
+    removed from the list, the multiplexer stops when the last one is.
 
     Parameters:
         targets: List[Callable] : list of target coros
+        close_targets: bool = False : whether closing the multiplexer
+            closes the targets too, leave it off for shared targets
 
     Returns:
         None: sends elements to targets
     """
 
-    while True:
-        element = (yield)
-        for target in targets:
-             target.send(element)
+    try:
+        while True:
+            element = (yield)
+
+            closed = []
+            for target in targets:
+                try:
+                    target.send(element)
+                except StopIteration:
+                    closed.append(target)
+
+            if closed:
+                for target in closed:
+                    targets.remove(target)
+                if not targets:
+                    return
+
+    finally:
+        if close_targets:
+            for target in targets:
+                target.close()
 
 @start_coro
-def filter_coro(cond: Callable, target: Callable) -> Generator:
+def filter_coro(
+        cond: Callable,
+        target: Callable,
+        close_target: bool = False
+    ) -> Generator:
     """
     Sends elements to a target which satisfy the specified condition.
+    Stops when the target is closed.
 
     Parameters:
         cond: Callable : unary boolean function called on an element
         target: Callable : target
+        close_target: bool = False : whether closing the filter
+            closes the target too
 
     Returns:
         None: sends selected elements to the target
@@ -72,10 +103,19 @@ def filter_coro(cond: Callable, target: Callable) -> Generator:
 
     # this loop is needed to keep the coroutine alive
     # otherwise it would exit after the first `send`
-    while True:
-        element = (yield)
-        if cond(element):
-            target.send(element)
+    try:
+        while True:
+            element = (yield)
+            if cond(element):
+                target.send(element)
+
+    # the target has been closed => stop as well
+    except StopIteration:
+        return
+
+    finally:
+        if close_target:
+            target.close()
 
 
 @start_coro
@@ -0,0 +1,33 @@
+"""
+Sketches as coroutine sinks.
+"""
+
+from typing import (
+    Any,
+    Generator
+)
+
+from .multiplexer_coro import (
+    start_coro
+)
+
+
+@start_coro
+def sketch_coro(sketch: Any, chunked: bool = False) -> Generator:
+    """
+    Updates a sketch with the sent elements.
+
+    Parameters:
+        sketch: Any : sketch with `update` and `update_many` methods
+            e.g. `CountMinSketch`, `HyperLogLog`, `KLLSketch`
+        chunked: bool = False : whether numpy chunks are sent
+
+    Returns:
+        None : updates the sketch
+    """
+
+    update = sketch.update_many if chunked else sketch.update
+
+    while True:
+        element = (yield)
+        update(element)
@@ -0,0 +1,139 @@
+"""
+Generator combinators.
+
+Only the basic combinators and the batchers are imported eagerly,
+so that short lived workers which need e.g. `filtr` and `make_batcher`
+start fast. The other modules are imported on first access.
+"""
+
+import importlib
+import sys
+import types
+
+from .basic import (
+    filtr,
+    identity,
+    repeater,
+    thinner
+)
+
+from .batches import (
+    loop_terminate_batch_function,
+    make_batcher,
+    prepend_generator,
+    serialiser,
+    taker
+)
+
+
+# public name => module which is imported when the name is first accessed
+_LAZY_NAMES = {
+    "AIMDController": ".adaptive",
+    "AdaptiveBatcher": ".adaptive",
+    "PIDController": ".adaptive",
+    "make_adaptive_batcher": ".adaptive",
+    "FrameSerialiser": ".batch_format",
+    "batch_reader": ".batch_format",
+    "batch_writer": ".batch_format",
+    "read_batch": ".batch_format",
+    "write_batch": ".batch_format",
+    "make_batch_selector_cond1": ".batch_selectors",
+    "make_batch_selector_cond2": ".batch_selectors",
+    "make_batch_selector_cond_count": ".batch_selectors",
+    "select_batches_cond_count_array": ".batch_selectors",
+    "distinct": ".distinct",
+    "distinct_approximate": ".distinct",
+    "distinct_array_chunks": ".distinct",
+    "make_keyed_batcher": ".group_by",
+    "EMPTY": ".multi_input",
+    "compressor": ".multi_input",
+    "gater": ".multi_input",
+    "merger": ".multi_input",
+    "scheduled_merger": ".multi_input",
+    "switcher": ".multi_input",
+    "zipper": ".multi_input",
+    "multiplexer": ".multiplexer",
+    "RecordBatch": ".record_batch",
+    "compressor_batches": ".record_batch",
+    "filtr_batches": ".record_batch",
+    "make_batcher_batches": ".record_batch",
+    "thinner_batches": ".record_batch",
+    "zipper_batches": ".record_batch",
+    "CountMinSketch": ".sketches",
+    "HyperLogLog": ".sketches",
+    "KLLSketch": ".sketches",
+    "sketch_sink": ".sketches",
+    "ThrottleStats": ".throttle",
+    "TokenBucket": ".throttle",
+    "throttle": ".throttle",
+    "throttle_async": ".throttle",
+    "throttle_batches": ".throttle",
+    "sliding_aggregate_array": ".windows",
+    "sliding_aggregate_chunks": ".windows",
+    "sliding_max": ".windows",
+    "sliding_mean": ".windows",
+    "sliding_min": ".windows",
+    "sliding_quantile": ".windows",
+    "sliding_sum": ".windows",
+    "sliding_windows": ".windows",
+    "tumbling_aggregate": ".windows",
+    "class_sampler": ".samplers.mixture",
+    "cycle_cached": ".samplers.mixture",
+    "load_sample_plan": ".samplers.mixture",
+    "make_sample_plan": ".samplers.mixture",
+    "replay_sample_plan": ".samplers.mixture",
+    "class_record_iterators": ".file_io",
+    "line_batches": ".file_io",
+    "line_iterator": ".file_io",
+    "record_batches": ".file_io",
+    "record_iterator": ".file_io",
+    "record_memoryview_batches": ".file_io",
+    "PartitionError": ".partitioned",
+    "partitioned_executor": ".partitioned",
+    "ArraySerialiser": ".spill_buffer",
+    "PickleSerialiser": ".spill_buffer",
+    "SpillBuffer": ".spill_buffer"
+}
+
+
+def __getattr__(name: str):
+    """
+    Imports the module of a lazily exported name.
+
+    Parameters:
+        name: str : name of the attribute
+
+    Returns:
+        : Any : the attribute
+    """
+
+    if name not in _LAZY_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(_LAZY_NAMES[name], __name__)
+    value = getattr(module, name)
+
+    # later accesses do not go through this function
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    """Lists the eager and the lazy names."""
+    return sorted(set(globals()) | set(_LAZY_NAMES))
+
+
+class _Package(types.ModuleType):
+    """
+    Importing a submodule binds it to the package. Such a binding must
+    not shadow a function of the same name e.g. `throttle` or `distinct`.
+    """
+
+    def __setattr__(self, name: str, value) -> None:
+        if isinstance(value, types.ModuleType) and name in _LAZY_NAMES:
+            return
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
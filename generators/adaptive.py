@@ -0,0 +1,289 @@
+"""
+Batch generator whose batch size follows the downstream latency.
+"""
+
+import itertools
+import time
+
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    List
+)
+
+
+class AIMDController:
+    """
+    Additive increase, multiplicative decrease of the batch size.
+    The size grows by a constant while the latency of a batch is
+    within the target and is cut by a factor when it exceeds it.
+    """
+
+    def __init__(
+            self,
+            target_latency: float,
+            n_min: int = 1,
+            n_max: int = 65536,
+            increase: int = 1,
+            decrease: float = 0.5
+        ) -> None:
+        """
+        Sets the target and the bounds.
+
+        Parameters:
+            target_latency: float : processing time of a batch in seconds
+            n_min: int = 1 : smallest batch size
+            n_max: int = 65536 : largest batch size
+            increase: int = 1 : additive step
+            decrease: float = 0.5 : multiplicative factor
+
+        Returns:
+            None
+        """
+
+        self.target_latency = target_latency
+        self.n_min = n_min
+        self.n_max = n_max
+        self.increase = increase
+        self.decrease = decrease
+
+    def __call__(self, n: int, latency: float) -> int:
+        """
+        Calculates the next batch size.
+
+        Parameters:
+            n: int : size of the last batch
+            latency: float : processing time of the last batch
+
+        Returns:
+            n_next: int : size of the next batch
+        """
+
+        if latency <= self.target_latency:
+            n_next = n + self.increase
+        else:
+            n_next = int(n * self.decrease)
+
+        return min(max(n_next, self.n_min), self.n_max)
+
+
+class PIDController:
+    """
+    Proportional-integral-derivative control of the batch size.
+    The relative error of the latency or throughput scales the size.
+    """
+
+    def __init__(
+            self,
+            target: float,
+            measure: str = "latency",
+            n_min: int = 1,
+            n_max: int = 65536,
+            kp: float = 0.5,
+            ki: float = 0.05,
+            kd: float = 0.1
+        ) -> None:
+        """
+        Sets the target, the bounds and the gains.
+
+        Parameters:
+            target: float : processing time of a batch in seconds
+                or number of elements processed per second
+            measure: str = "latency" : "latency" or "throughput"
+            n_min: int = 1 : smallest batch size
+            n_max: int = 65536 : largest batch size
+            kp: float = 0.5 : proportional gain
+            ki: float = 0.05 : integral gain
+            kd: float = 0.1 : derivative gain
+
+        Returns:
+            None
+        """
+
+        if measure not in ("latency", "throughput"):
+            raise ValueError(f"Unknown measure: {measure}")
+
+        self.target = target
+        self.measure = measure
+        self.n_min = n_min
+        self.n_max = n_max
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+
+        self.integral = 0.0
+        self.error_last = 0.0
+
+    def __call__(self, n: int, latency: float) -> int:
+        """
+        Calculates the next batch size.
+
+        Parameters:
+            n: int : size of the last batch
+            latency: float : processing time of the last batch
+
+        Returns:
+            n_next: int : size of the next batch
+        """
+
+        if self.measure == "latency":
+            value = latency
+        else:
+            value = n / latency if latency > 0 else float("inf")
+
+        # positive => the batch can be larger: the latency is below the
+        # target or the throughput is (larger batches amortise more)
+        error = (self.target - value) / self.target
+        error = max(min(error, 1.0), -1.0)
+
+        self.integral = max(min(self.integral + error, 10.0), -10.0)
+        derivative = error - self.error_last
+        self.error_last = error
+
+        factor = 1 + self.kp * error + self.ki * self.integral + self.kd * derivative
+        n_next = int(round(n * max(factor, 0.1)))
+
+        return min(max(n_next, self.n_min), self.n_max)
+
+
+class AdaptiveBatcher:
+    """
+    Generator of list batches whose size is set by a controller.
+
+    The latency of a batch is either sent back by the consumer
+
+        batch = next(batcher)
+        while True:
+            ...  # process batch
+            batch = batcher.send(elapsed)
+
+    or reported with `report`, otherwise it is measured as the time
+    between handing out a batch and the request of the next one.
+    """
+
+    def __init__(
+            self,
+            iterator: Iterator,
+            controller: Callable,
+            n_init: int = 1,
+            clock: Callable = time.perf_counter
+        ) -> None:
+        """
+        Sets up the batcher.
+
+        Parameters:
+            iterator: Iterator : iterator to be consumed
+            controller: Callable : (size, latency) => next size
+                e.g. `AIMDController` or `PIDController`
+            n_init: int = 1 : size of the first batch
+            clock: Callable = time.perf_counter : source of time
+
+        Returns:
+            None
+        """
+
+        self.iterator = iterator
+        self.controller = controller
+        self.n = n_init
+        self.clock = clock
+
+        # size of each batch and the latency measured for it
+        self.history: List[int] = []
+        self.latencies: List[float] = []
+
+        self._time_yielded = None
+        self._is_reported = True
+
+    def __iter__(self) -> "AdaptiveBatcher":
+        """Make an iterator. Sufficient to return self."""
+        return self
+
+    def __next__(self) -> List[Any]:
+        """
+        Produces the next batch.
+        """
+
+        if not self._is_reported:
+            self._adjust(self.clock() - self._time_yielded)
+
+        batch = list(itertools.islice(self.iterator, self.n))
+        if not batch:
+            raise StopIteration
+
+        self.history.append(len(batch))
+        self._time_yielded = self.clock()
+        self._is_reported = False
+
+        return batch
+
+    def send(self, latency: float) -> List[Any]:
+        """
+        Reports the latency of the last batch and produces the next one.
+
+        Parameters:
+            latency: float : processing time of the last batch
+
+        Returns:
+            batch: List[Any] : next batch
+        """
+
+        self.report(latency)
+
+        return next(self)
+
+    def report(self, latency: float) -> None:
+        """
+        Reports the latency of the last batch.
+
+        Parameters:
+            latency: float : processing time of the last batch
+
+        Returns:
+            None
+        """
+
+        if not self._is_reported:
+            self._adjust(latency)
+
+    def _adjust(self, latency: float) -> None:
+        """
+        Sets the size of the next batch.
+
+        Parameters:
+            latency: float : processing time of the last batch
+
+        Returns:
+            None
+        """
+
+        self._is_reported = True
+        self.latencies.append(latency)
+        self.n = self.controller(self.history[-1], latency)
+
+
+def make_adaptive_batcher(
+        iterator: Iterator,
+        target_latency: float,
+        n_min: int = 1,
+        n_max: int = 65536,
+        n_init: int = None
+    ) -> AdaptiveBatcher:
+    """
+    Makes a generator of batches whose size is adjusted towards
+    a target latency by AIMD.
+
+    Parameters:
+        iterator: Iterator : iterator to be consumed
+        target_latency: float : processing time of a batch in seconds
+        n_min: int = 1 : smallest batch size
+        n_max: int = 65536 : largest batch size
+        n_init: int = None : size of the first batch, defaults to n_min
+
+    Returns:
+        batcher: AdaptiveBatcher : generator of batches
+    """
+
+    controller = AIMDController(target_latency, n_min, n_max)
+
+    return AdaptiveBatcher(iterator, controller, n_init or n_min)
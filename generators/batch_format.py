@@ -0,0 +1,272 @@
+"""
+Length prefixed binary format of batches for spooling and IPC.
+
+A frame is
+
+    magic: 4 bytes
+    flags: uint8 (bit 0: compressed)
+    n_buffer: uint32
+    header length: uint64
+    buffer lengths: n_buffer * uint64
+    header: pickled batch (protocol 5)
+    buffers: raw data of the out-of-band buffers e.g. numpy arrays
+
+Large contiguous arrays are written and read as raw buffers
+without being copied into the pickle stream.
+"""
+
+import pickle
+import struct
+import types
+
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Generator,
+    Iterator,
+    List
+)
+
+
+MAGIC = b"GBF1"
+
+_PREFIX = struct.Struct("<4sBIQ")
+
+_FLAG_COMPRESSED = 1
+
+# returned at the end of the file, a stored batch can be None
+_END = object()
+
+
+def write_batch(
+        fp: BinaryIO,
+        batch: Any,
+        compress: Callable = None
+    ) -> int:
+    """
+    Writes a batch as a frame.
+
+    Parameters:
+        fp: BinaryIO : file opened for binary writing
+        batch: Any : picklable batch, generators are materialised to lists
+        compress: Callable = None : bytes-like => bytes function applied
+            to the header and each buffer e.g. `zlib.compress`
+
+    Returns:
+        n_byte: int : number of bytes written
+    """
+
+    if isinstance(batch, types.GeneratorType):
+        batch = list(batch)
+
+    buffers: List[Any] = []
+    header = pickle.dumps(batch, protocol=5, buffer_callback=buffers.append)
+    buffers = [buffer.raw() for buffer in buffers]
+
+    flags = 0
+    if compress is not None:
+        flags |= _FLAG_COMPRESSED
+        header = compress(header)
+        buffers = [compress(buffer) for buffer in buffers]
+
+    lengths = [len(header)] + [memoryview(buffer).nbytes for buffer in buffers]
+
+    prefix = _PREFIX.pack(MAGIC, flags, len(buffers), lengths[0])
+    prefix += struct.pack(f"<{len(buffers)}Q", *lengths[1:])
+
+    fp.write(prefix)
+    fp.write(header)
+    for buffer in buffers:
+        fp.write(buffer)
+
+    return len(prefix) + sum(lengths)
+
+
+def read_batch(
+        fp: BinaryIO,
+        decompress: Callable = None
+    ) -> Any:
+    """
+    Reads a batch from a frame. The raw buffers are read into
+    bytearrays which back the restored arrays.
+
+    Parameters:
+        fp: BinaryIO : file opened for binary reading
+        decompress: Callable = None : inverse of the compression function
+
+    Returns:
+        batch: Any : batch! EOFError is raised at the end
+            of the file (like `pickle.load`) or on a truncated frame
+    """
+
+    batch = _read_frame(fp, decompress)
+    if batch is _END:
+        raise EOFError("End of file.")
+
+    return batch
+
+
+def _read_frame(
+        fp: BinaryIO,
+        decompress: Callable = None
+    ) -> Any:
+    """
+    Reads a batch from a frame.
+
+    Parameters:
+        fp: BinaryIO : file opened for binary reading
+        decompress: Callable = None : inverse of the compression function
+
+    Returns:
+        batch: Any : batch, `_END` at the end of the file
+    """
+
+    prefix = fp.read(_PREFIX.size)
+    if not prefix:
+        return _END
+
+    if len(prefix) < _PREFIX.size:
+        raise EOFError("Truncated frame.")
+
+    magic, flags, n_buffer, n_header = _PREFIX.unpack(prefix)
+    if magic != MAGIC:
+        raise ValueError(f"Not a batch frame: {magic!r}")
+
+    lengths = struct.unpack(f"<{n_buffer}Q", _read_exact(fp, 8 * n_buffer))
+
+    header = _read_exact(fp, n_header)
+    buffers = [_read_exact(fp, length) for length in lengths]
+
+    if flags & _FLAG_COMPRESSED:
+        if decompress is None:
+            raise ValueError("Compressed frame, but no decompress function is given.")
+        header = decompress(header)
+        buffers = [bytearray(decompress(buffer)) for buffer in buffers]
+
+    return pickle.loads(header, buffers=buffers)
+
+
+def _read_exact(fp: BinaryIO, n: int) -> bytearray:
+    """
+    Reads exactly n bytes into a new buffer.
+
+    Parameters:
+        fp: BinaryIO : file opened for binary reading
+        n: int : number of bytes
+
+    Returns:
+        buffer: bytearray : n bytes
+    """
+
+    buffer = bytearray(n)
+    view = memoryview(buffer)
+
+    pos = 0
+    while pos < n:
+        n_read = fp.readinto(view[pos:])
+        if not n_read:
+            raise EOFError("Truncated frame.")
+        pos += n_read
+
+    return buffer
+
+
+def batch_writer(
+        batches: Iterator,
+        fp: BinaryIO,
+        compress: Callable = None
+    ) -> Generator:
+    """
+    Creates a generator which writes the batches passing through it.
+
+    Parameters:
+        batches: Iterator : batches!
+        fp: BinaryIO : file opened for binary writing
+        compress: Callable = None : compression function
+
+    Yields:
+        batch: Any : the written batch (materialised if it was a generator)
+    """
+
+    for batch in batches:
+        if isinstance(batch, types.GeneratorType):
+            batch = list(batch)
+
+        write_batch(fp, batch, compress)
+        yield batch
+
+
+def batch_reader(
+        fp: BinaryIO,
+        decompress: Callable = None
+    ) -> Generator:
+    """
+    Creates a generator of the batches of a file.
+
+    Parameters:
+        fp: BinaryIO : file opened for binary reading
+        decompress: Callable = None : decompression function
+
+    Yields:
+        batch: Any : batch!
+    """
+
+    while True:
+        batch = _read_frame(fp, decompress)
+        if batch is _END:
+            return
+        yield batch
+
+
+class FrameSerialiser:
+    """
+    Serialises a segment of elements as a single frame
+    e.g. for `SpillBuffer`.
+    """
+
+    def __init__(
+            self,
+            compress: Callable = None,
+            decompress: Callable = None
+        ) -> None:
+        """
+        Sets the compression.
+
+        Parameters:
+            compress: Callable = None : compression function
+            decompress: Callable = None : decompression function
+
+        Returns:
+            None
+        """
+
+        self.compress = compress
+        self.decompress = decompress
+
+    def dump(self, elements: List[Any], fp: BinaryIO) -> None:
+        """
+        Writes elements to a file.
+
+        Parameters:
+            elements: List[Any] : elements of a segment
+            fp: BinaryIO : file opened for writing
+
+        Returns:
+            None
+        """
+
+        write_batch(fp, elements, self.compress)
+
+    def load(self, fp: BinaryIO) -> List[Any]:
+        """
+        Reads a segment of elements from a file.
+
+        Parameters:
+            fp: BinaryIO : file opened for reading
+
+        Returns:
+            elements: List[Any] : elements of the segment
+        """
+
+        return read_batch(fp, self.decompress)
@@ -2,6 +2,8 @@
 Retrieve batches based on conditions.
 """
 
+import itertools
+
 from typing import (
     Any,
     Callable,
@@ -9,7 +11,7 @@ from typing import (
     Iterator
 )
 
-from src.generators.batches import (
+from .batches import (
     loop_terminate_batch_function,
     prepend_generator
 )
@@ -170,28 +172,77 @@ def make_batch_selector_cond_count(
             element: Any : element!
         """
 
-        has_batch_started = False
-        # counter of elements selected to the batch
-        i = 0
-
+        # only the start has to be searched for elementwise
         for element in iterator:
+            if cond_start(element):
+                break
+        else:
+            return
 
-            if not has_batch_started:
-                if cond_start(element):
+        if yield_start:
+            # the starting element counts towards the batch size
+            yield element
+            n_remaining = n - 1
+        else:
+            n_remaining = n
 
-                    if yield_start:
-                        i += 1
-                        yield element
+        # once started the batch length is known => take it in bulk
+        yield from itertools.islice(iterator, n_remaining)
 
-                    has_batch_started = True
-            else:
-                i += 1
-                # enough elements in the batch =>
-                if i == n + 1:
-                    # => terminate iteration
-                    break
-                else:
-                    # select element to the batch
-                    yield element
+        # the element following a full batch is consumed
+        next(iterator, None)
 
     return loop_terminate_batch_function(selector_function)
+
+
+def select_batches_cond_count_array(
+        array: Any,
+        cond_start: Callable,
+        n: int,
+        yield_start: bool
+    ) -> Generator:
+    """
+    Array counterpart of `make_batch_selector_cond_count`.
+    The start condition is evaluated once on the whole array
+    and the batches are yielded as views.
+
+    Parameters:
+        array: np.ndarray : 1D array to split to batches
+        cond_start: Callable : vectorised condition to mark batch start
+            i.e. it returns a boolean mask when called on the array
+            e.g. `curry_2arg(operator.gt, 0)` or `vectorise_predicate(cond)`
+        n: int : number of elements in the batch
+        yield_start: bool : whether to yield element opening the batch
+
+    Yields:
+        batch: np.ndarray : a slice of the array
+    """
+
+    import numpy as np
+
+    starts = np.flatnonzero(cond_start(array))
+    offset = 0 if yield_start else 1
+    size = len(array)
+
+    # the batch each start would open, computed for all starts at once
+    pos_starts = starts + offset
+    pos_ends = np.minimum(pos_starts + n, size)
+
+    # index of the first start after the batch of each start
+    # the element following a batch is skipped (see above)
+    i_nexts = np.searchsorted(starts, pos_ends + 1).tolist()
+    pos_starts = pos_starts.tolist()
+    pos_ends = pos_ends.tolist()
+
+    # follow the chain of starts which are not part of a previous batch
+    i_start = 0
+    while i_start < len(pos_starts):
+        pos_start = pos_starts[i_start]
+
+        # start without an element after it => empty batch => stop
+        if pos_start >= size:
+            return
+
+        yield array[pos_start:pos_ends[i_start]]
+
+        i_start = i_nexts[i_start]
@@ -0,0 +1,412 @@
+"""
+Removal of duplicate elements with bounded memory.
+"""
+
+import collections
+import hashlib
+import math
+import pickle
+
+from typing import (
+    Any,
+    Callable,
+    Generator,
+    Iterator
+)
+
+
+def distinct(
+        iterator: Iterator,
+        max_size: int = None,
+        key: Callable = None
+    ) -> Generator:
+    """
+    Creates a generator which drops the elements already seen.
+    At most `max_size` keys are remembered, the least recently
+    seen ones are forgotten first.
+
+    Parameters:
+        iterator: Iterator : iterator!
+        max_size: int = None : maximum number of remembered keys,
+            unbounded if None
+        key: Callable = None : unary function to compute the identity of
+            an element, defaults to the element itself
+
+    Yields:
+        element: Any : an element whose key has not been seen
+    """
+
+    seen = collections.OrderedDict()
+
+    for element in iterator:
+        element_key = element if key is None else key(element)
+
+        if element_key in seen:
+            seen.move_to_end(element_key)
+            continue
+
+        seen[element_key] = None
+        if max_size is not None and len(seen) > max_size:
+            seen.popitem(last=False)
+
+        yield element
+
+
+def distinct_approximate(
+        iterator: Iterator,
+        capacity: int,
+        error_rate: float = 0.001,
+        key: Callable = None
+    ) -> Generator:
+    """
+    Creates a generator which drops the elements already seen
+    using a rotating pair of Bloom filters. A unique element is
+    dropped with a probability of about `error_rate`. Elements
+    seen more than about `capacity` unique elements ago are forgotten.
+
+    Parameters:
+        iterator: Iterator : iterator!
+        capacity: int : number of unique elements per filter
+        error_rate: float = 0.001 : false positive rate of a filter
+        key: Callable = None : unary function to compute the identity of
+            an element, defaults to the element itself
+
+    Yields:
+        element: Any : an element whose key is probably not seen
+    """
+
+    filters = RotatingBloomFilter(capacity, error_rate)
+
+    for element in iterator:
+        element_key = element if key is None else key(element)
+
+        if filters.add(hash_key(element_key)):
+            yield element
+
+
+def distinct_array_chunks(
+        chunks: Iterator,
+        capacity: int,
+        error_rate: float = 0.001
+    ) -> Generator:
+    """
+    Creates a generator which drops the elements of numpy chunks
+    already seen. The elements of a chunk are hashed in a single call.
+
+    Parameters:
+        chunks: Iterator : iterator of 1D numeric arrays
+        capacity: int : number of unique elements per filter
+        error_rate: float = 0.001 : false positive rate of a filter
+
+    Yields:
+        chunk: np.ndarray : elements of a chunk which are probably not seen
+    """
+
+    import numpy as np
+
+    filters = RotatingBloomFilter(capacity, error_rate)
+
+    for chunk in chunks:
+        chunk = np.asarray(chunk)
+        hashes = hash_array(chunk)
+
+        # duplicates within the chunk are dropped explicitly
+        # as the filter is only updated after the lookup
+        _, i_first = np.unique(hashes, return_index=True)
+        i_first.sort()
+
+        mask = np.zeros(len(chunk), dtype=bool)
+        mask[i_first] = filters.add_many(hashes[i_first])
+
+        selected = chunk[mask]
+        if len(selected):
+            yield selected
+
+
+def hash_array(array: Any) -> Any:
+    """
+    Hashes the elements of a numeric array to 64 bit integers
+    with the splitmix64 finaliser.
+
+    Parameters:
+        array: np.ndarray : 1D array of fixed width elements
+
+    Returns:
+        hashes: np.ndarray : uint64 hash of each element
+    """
+
+    import numpy as np
+
+    array = np.ascontiguousarray(array)
+
+    # reinterpret as 8 byte words and fold them into one word per element
+    n_byte = array.dtype.itemsize
+    n_word = -(-n_byte // 8)
+    padded = np.zeros((len(array), n_word * 8), dtype=np.uint8)
+    padded[:, :n_byte] = array.view(np.uint8).reshape(len(array), n_byte)
+    words = padded.view(np.uint64)
+
+    hashes = np.zeros(len(array), dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for i in range(n_word):
+            hashes = _splitmix64(hashes ^ words[:, i])
+
+    return hashes
+
+
+def _splitmix64(x: Any) -> Any:
+    """
+    Mixes 64 bit integers.
+
+    Parameters:
+        x: np.ndarray : uint64 array
+
+    Returns:
+        : np.ndarray : mixed uint64 array
+    """
+
+    import numpy as np
+
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+
+    return x ^ (x >> np.uint64(31))
+
+
+def hash_key(element_key: Any) -> int:
+    """
+    Hashes a key to a 64 bit integer which is stable across processes.
+
+    Parameters:
+        element_key: Any : hashable or picklable key
+
+    Returns:
+        : int : 64 bit hash
+    """
+
+    if isinstance(element_key, bytes):
+        data = element_key
+    elif isinstance(element_key, str):
+        data = element_key.encode()
+    else:
+        data = pickle.dumps(element_key, protocol=pickle.HIGHEST_PROTOCOL)
+
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+class BloomFilter:
+    """
+    Bloom filter backed by a bytearray. The bit positions of a key
+    are derived from a single 64 bit hash by double hashing.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        """
+        Sizes the filter for the expected number of keys.
+
+        Parameters:
+            capacity: int : number of keys stored at the error rate
+            error_rate: float : false positive rate at capacity
+
+        Returns:
+            None
+        """
+
+        n_bit = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+
+        self.n_bit = max(n_bit, 8)
+        self.n_hash = max(round(self.n_bit / capacity * math.log(2)), 1)
+        self.bits = bytearray((self.n_bit + 7) // 8)
+        self.n_added = 0
+
+    def _positions(self, h: int) -> Generator:
+        """
+        Bit positions of a hash.
+
+        Parameters:
+            h: int : 64 bit hash
+
+        Yields:
+            : int : bit position
+        """
+
+        h1 = h & 0xFFFFFFFF
+        h2 = (h >> 32) | 1
+
+        for i in range(self.n_hash):
+            yield (h1 + i * h2) % self.n_bit
+
+    def __contains__(self, h: int) -> bool:
+        """Checks whether the hash is probably in the filter."""
+
+        bits = self.bits
+        return all(
+            bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(h)
+        )
+
+    def add(self, h: int) -> None:
+        """
+        Adds a hash to the filter.
+
+        Parameters:
+            h: int : 64 bit hash
+
+        Returns:
+            None
+        """
+
+        bits = self.bits
+        for pos in self._positions(h):
+            bits[pos >> 3] |= 1 << (pos & 7)
+
+        self.n_added += 1
+
+    def contains_many(self, hashes: Any) -> Any:
+        """
+        Checks whether the hashes are probably in the filter.
+
+        Parameters:
+            hashes: np.ndarray : uint64 hashes
+
+        Returns:
+            : np.ndarray : boolean mask
+        """
+
+        import numpy as np
+
+        bits = np.frombuffer(self.bits, dtype=np.uint8)
+        found = np.ones(len(hashes), dtype=bool)
+
+        for pos in self._positions_many(hashes):
+            found &= ((bits[pos >> 3] >> (pos & 7)) & 1).astype(bool)
+
+        return found
+
+    def add_many(self, hashes: Any) -> None:
+        """
+        Adds hashes to the filter.
+
+        Parameters:
+            hashes: np.ndarray : uint64 hashes
+
+        Returns:
+            None
+        """
+
+        import numpy as np
+
+        bits = np.frombuffer(self.bits, dtype=np.uint8)
+
+        for pos in self._positions_many(hashes):
+            np.bitwise_or.at(bits, pos >> 3, (1 << (pos & 7)).astype(np.uint8))
+
+        self.n_added += len(hashes)
+
+    def _positions_many(self, hashes: Any) -> Generator:
+        """
+        Bit positions of hashes.
+
+        Parameters:
+            hashes: np.ndarray : uint64 hashes
+
+        Yields:
+            : np.ndarray : int64 bit position of each hash
+        """
+
+        import numpy as np
+
+        h1 = (hashes & np.uint64(0xFFFFFFFF)).astype(np.int64)
+        h2 = ((hashes >> np.uint64(32)) | np.uint64(1)).astype(np.int64)
+
+        for i in range(self.n_hash):
+            yield (h1 + i * h2) % self.n_bit
+
+
+class RotatingBloomFilter:
+    """
+    Pair of Bloom filters. Keys are added to the current one,
+    lookups check both. Once the current filter is full,
+    the previous one is dropped => memory is bounded.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        """
+        Creates the filters.
+
+        Parameters:
+            capacity: int : number of keys per filter
+            error_rate: float : false positive rate of a filter
+
+        Returns:
+            None
+        """
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+
+        self.current = BloomFilter(capacity, error_rate)
+        self.previous = None
+
+    def add(self, h: int) -> bool:
+        """
+        Adds a hash if it is probably not present.
+
+        Parameters:
+            h: int : 64 bit hash
+
+        Returns:
+            : bool : whether the hash is new
+        """
+
+        if h in self.current or (self.previous is not None and h in self.previous):
+            return False
+
+        self._rotate_if_full()
+        self.current.add(h)
+
+        return True
+
+    def add_many(self, hashes: Any) -> Any:
+        """
+        Adds the distinct hashes which are probably not present.
+
+        Parameters:
+            hashes: np.ndarray : distinct uint64 hashes
+
+        Returns:
+            is_new: np.ndarray : boolean mask of the new hashes
+        """
+
+        is_new = ~self.current.contains_many(hashes)
+        if self.previous is not None:
+            is_new &= ~self.previous.contains_many(hashes)
+
+        new = hashes[is_new]
+
+        # fill the current filter up to its capacity before rotating
+        while len(new):
+            n_free = max(self.capacity - self.current.n_added, 0)
+            if n_free == 0:
+                self._rotate_if_full()
+                continue
+
+            self.current.add_many(new[:n_free])
+            new = new[n_free:]
+
+        return is_new
+
+    def _rotate_if_full(self) -> None:
+        """
+        Starts a new filter if the current one is at capacity.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+
+        if self.current.n_added >= self.capacity:
+            self.previous = self.current
+            self.current = BloomFilter(self.capacity, self.error_rate)
@@ -0,0 +1,215 @@
+"""
+File backed sources of the generator pipelines.
+"""
+
+import mmap
+import os
+
+from typing import (
+    Any,
+    Generator,
+    Iterator,
+    List,
+    Tuple
+)
+
+from .batches import (
+    serialiser
+)
+
+
+def record_batches(
+        path: str,
+        dtype: Any,
+        n: int,
+        offset: int = 0
+    ) -> Generator:
+    """
+    Creates a generator of batches of fixed width records
+    from a binary file. The batches are views of a memory map,
+    no records are copied or boxed.
+
+    Parameters:
+        path: str : path to the record file
+        dtype: Any : numpy dtype of a record (can be structured)
+        n: int : number of records in a batch, the last one can be shorter
+        offset: int = 0 : number of header bytes to skip
+
+    Yields:
+        batch: np.memmap : n consecutive records
+    """
+
+    import numpy as np
+
+    # a trailing partial record is ignored
+    n_record = (os.path.getsize(path) - offset) // np.dtype(dtype).itemsize
+
+    # mapping an empty file raises
+    if n_record <= 0:
+        return
+
+    records = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(n_record,))
+
+    for i in range(0, len(records), n):
+        yield records[i:i + n]
+
+
+def record_memoryview_batches(
+        path: str,
+        record_size: int,
+        n: int
+    ) -> Generator:
+    """
+    Creates a generator of batches of fixed width records
+    as memoryviews of the mapped file. Does not require numpy.
+
+    Parameters:
+        path: str : path to the record file
+        record_size: int : size of a record in bytes
+        n: int : number of records in a batch, the last one can be shorter
+
+    Yields:
+        batch: Generator : memoryviews of the n records of the batch
+    """
+
+    with open(path, "rb") as fp:
+        if os.fstat(fp.fileno()).st_size == 0:
+            return
+        mapped = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+    view = memoryview(mapped)
+    n_record = len(view) // record_size
+    batch_size = n * record_size
+
+    # a trailing partial record is ignored
+    size = n_record * record_size
+
+    for start in range(0, size, batch_size):
+        end = min(start + batch_size, size)
+        yield _record_views(view, start, end, record_size)
+
+
+def _record_views(
+        view: memoryview,
+        start: int,
+        end: int,
+        record_size: int
+    ) -> Generator:
+    """
+    Creates a generator of the records of a batch. Multidimensional
+    memoryviews cannot be iterated, the records are sliced one by one.
+
+    Parameters:
+        view: memoryview : view of the whole file
+        start: int : byte offset of the batch
+        end: int : byte offset of the end of the batch
+        record_size: int : size of a record in bytes
+
+    Yields:
+        record: memoryview : view of a record
+    """
+
+    for i in range(start, end, record_size):
+        yield view[i:i + record_size]
+
+
+def record_iterator(
+        path: str,
+        dtype: Any,
+        n: int = 65536
+    ) -> Generator:
+    """
+    Creates a generator of individual records read in memory mapped
+    blocks e.g. to be used as a per class source of `switcher`.
+
+    Parameters:
+        path: str : path to the record file
+        dtype: Any : numpy dtype of a record
+        n: int = 65536 : number of records read in a block
+
+    Returns:
+        records: Generator : elementwise generator of the records
+    """
+
+    return serialiser(record_batches(path, dtype, n))
+
+
+def class_record_iterators(
+        paths: List[str],
+        dtype: Any
+    ) -> Tuple[Iterator]:
+    """
+    Creates the per class sources of `class_sampler` from one file per class.
+
+    Parameters:
+        paths: List[str] : path to the record file of each class
+        dtype: Any : numpy dtype of a record
+
+    Returns:
+        iterators: Tuple[Iterator] : record generator per class
+    """
+
+    return tuple(record_iterator(path, dtype) for path in paths)
+
+
+def line_batches(
+        path: str,
+        block_size: int = 1 << 20,
+        encoding: str = None
+    ) -> Generator:
+    """
+    Creates a generator of batches of lines of a text file which
+    is read in large blocks. A batch holds the complete lines of a block.
+
+    Parameters:
+        path: str : path to the newline delimited file
+        block_size: int = 1 << 20 : number of bytes read at a time
+        encoding: str = None : decode lines if set, otherwise they are bytes
+
+    Yields:
+        batch: List[Any] : lines without the trailing newline
+    """
+
+    remainder = b""
+
+    with open(path, "rb", buffering=0) as fp:
+        while True:
+            block = fp.read(block_size)
+            if not block:
+                break
+
+            lines = (remainder + block).split(b"\n")
+            # the last piece may be an incomplete line
+            remainder = lines.pop()
+
+            if not lines:
+                continue
+
+            if encoding is not None:
+                lines = [line.decode(encoding) for line in lines]
+
+            yield lines
+
+    if remainder:
+        yield [remainder.decode(encoding) if encoding else remainder]
+
+
+def line_iterator(
+        path: str,
+        block_size: int = 1 << 20,
+        encoding: str = None
+    ) -> Generator:
+    """
+    Creates a generator of the lines of a text file which
+    is read in large blocks.
+
+    Parameters:
+        path: str : path to the newline delimited file
+        block_size: int = 1 << 20 : number of bytes read at a time
+        encoding: str = None : decode lines if set, otherwise they are bytes
+
+    Returns:
+        lines: Generator : elementwise generator of the lines
+    """
+
+    return serialiser(line_batches(path, block_size, encoding))
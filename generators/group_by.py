@@ -0,0 +1,106 @@
+"""
+Batches of interleaved streams grouped by key.
+"""
+
+import collections
+import time
+
+from typing import (
+    Any,
+    Callable,
+    Generator,
+    Iterator
+)
+
+
+def make_keyed_batcher(
+        iterator: Iterator,
+        key: Callable,
+        n: int = None,
+        cond_end: Callable = None,
+        timeout: float = None,
+        max_groups: int = None,
+        clock: Callable = time.monotonic
+    ) -> Generator:
+    """
+    Creates a generator which routes the elements into per key batches.
+    A batch is emitted when
+
+        i) it has n elements
+        ii) an element satisfies the end condition (it is the last one)
+        iii) no element has been added to it for `timeout` seconds
+        iv) its group is the least recently used one and there are
+            more than `max_groups` open groups
+        v) the iterator is exhausted.
+
+    The open groups are kept in least recently used order, hence
+    each check is O(1) per element. The timeouts are only checked
+    when an element arrives.
+
+    Parameters:
+        iterator: Iterator : iterator!
+        key: Callable : unary function which returns the key of an element
+        n: int = None : maximum number of elements in a batch
+        cond_end: Callable = None : condition to mark batch end
+        timeout: float = None : maximum idle time of a group
+        max_groups: int = None : maximum number of open groups
+        clock: Callable = time.monotonic : source of time
+
+    Yields:
+        : Tuple[Any, List[Any]] : key and the elements of a batch
+    """
+
+    # key => (time of last update, elements), least recently used first
+    groups = collections.OrderedDict()
+
+    for element in iterator:
+        group_key = key(element)
+        now = clock() if timeout is not None else None
+
+        # flush the idle groups
+        if timeout is not None:
+            while groups:
+                last_update = next(iter(groups.values()))[0]
+                if now - last_update < timeout:
+                    break
+                yield _pop_oldest(groups)
+
+        entry = groups.get(group_key)
+        if entry is None:
+            batch = []
+        else:
+            batch = entry[1]
+            groups.move_to_end(group_key)
+
+        batch.append(element)
+
+        if (n is not None and len(batch) == n) or \
+                (cond_end is not None and cond_end(element)):
+            groups.pop(group_key, None)
+            yield group_key, batch
+            continue
+
+        groups[group_key] = (now, batch)
+
+        # flush the least recently used group
+        if max_groups is not None and len(groups) > max_groups:
+            yield _pop_oldest(groups)
+
+    while groups:
+        yield _pop_oldest(groups)
+
+
+def _pop_oldest(groups: collections.OrderedDict) -> Any:
+    """
+    Removes the least recently used group.
+
+    Parameters:
+        groups: OrderedDict : open groups
+
+    Returns:
+        : Tuple[Any, List[Any]] : key and the elements of a batch
+    """
+
+    group_key, (_, batch) = groups.popitem(last=False)
+
+    return group_key, batch
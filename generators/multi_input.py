@@ -2,17 +2,27 @@
 Multiple input generators.
 """
 
+import heapq
+import itertools
+import time
+
 from typing import (
+    Callable,
     Iterator,
     Generator,
+    Sequence,
     Tuple
 )
 
-from src.generators.batches import (
+from .batches import (
     loop_terminate_batch_function
 )
 
 
+# yielded by a non-blocking source when it has no element ready
+EMPTY = object()
+
+
 def compressor(
         iterator: Iterator,
         selector: Iterator
@@ -85,6 +95,105 @@ def merger(*iterators) -> Generator:
                 return
 
 
+def scheduled_merger(
+        iterators: Sequence[Iterator],
+        weights: Sequence[float] = None,
+        priorities: Sequence[int] = None,
+        on_idle: Callable = None,
+        poll_interval: float = 0.001
+    ) -> Generator:
+    """
+    Merges iterators by weighted fair queuing or strict priority.
+    Exhausted iterators are dropped, the merge ends when all of them
+    are exhausted. A non-blocking source yields `EMPTY` when it has no
+    element ready, it is retried later.
+
+    Weighted fair queuing: each input has a virtual finish time which
+    advances by 1 / weight when it is served. The input with the
+    earliest time is served next => inputs are served proportionally
+    to their weights. Empty inputs do not accumulate credit.
+
+    Strict priority: the input with the lowest priority value is served
+    while it has elements, inputs of equal priority take turns.
+
+    The next input is chosen from a heap, O(log k) per element.
+
+    Parameters:
+        iterators: Sequence[Iterator] : inputs!
+        weights: Sequence[float] = None : share of each input,
+            equal shares if neither weights nor priorities are given
+        priorities: Sequence[int] = None : priority of each input,
+            lower is served first
+        on_idle: Callable = None : called when all inputs are empty,
+            defaults to sleeping `poll_interval` seconds
+        poll_interval: float = 0.001 : wait when all inputs are empty
+
+    Yields:
+        : Any : element from one of the inputs
+    """
+
+    if weights is not None and priorities is not None:
+        raise ValueError("Either weights or priorities can be given.")
+
+    if on_idle is None:
+        on_idle = lambda: time.sleep(poll_interval)
+
+    n = len(iterators)
+    is_priority = priorities is not None
+
+    if is_priority:
+        steps = [0] * n
+        keys = list(priorities)
+    else:
+        if weights is None:
+            weights = [1] * n
+        steps = [1 / weight for weight in weights]
+        keys = list(steps)
+
+    # (key, sequence number, input index), the sequence number breaks
+    # ties in first in first out order => equal keys take turns
+    counter = itertools.count()
+    heap = [(keys[i], next(counter), i) for i in range(n)]
+    heapq.heapify(heap)
+
+    # virtual time of the last service
+    virtual_now = 0
+
+    # inputs found empty since the last element => not polled again
+    # until an element is yielded or all of them are found empty
+    waiting = []
+
+    while heap or waiting:
+
+        if not heap:
+            on_idle()
+        else:
+            key, _, i = heapq.heappop(heap)
+
+            try:
+                element = next(iterators[i])
+            except StopIteration:
+                continue
+
+            if element is EMPTY:
+                waiting.append((key, i))
+                continue
+
+            if not is_priority:
+                virtual_now = max(virtual_now, key - steps[i])
+                key += steps[i]
+            heapq.heappush(heap, (key, next(counter), i))
+
+            yield element
+
+        # no credit for the time spent empty
+        for key, i in waiting:
+            if not is_priority:
+                key = max(key, virtual_now + steps[i])
+            heapq.heappush(heap, (key, next(counter), i))
+        waiting = []
+
+
 def switcher(
         iterators: Tuple[Iterator],
         switch: Iterator
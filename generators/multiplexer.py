@@ -9,12 +9,14 @@ from typing import (
     Dict,
     Generator,
     Iterator,
+    MutableMapping,
     Tuple
 )
 
 def multiplexer(
         iterator: Iterator,
-        n: int
+        n: int,
+        buffer: MutableMapping = None
     ) -> Tuple[Generator]:
     """
     Creates indenpendent and identiacal generators from an iterator.
@@ -22,13 +24,19 @@ def multiplexer(
     Parameters:
         iterator: Iterator : iterator!
         n: int : number of generators to create
+        buffer: MutableMapping = None : storage of the elements
+            not yet yielded by all generators e.g. a `SpillBuffer`
+            when some generators lag far behind. Defaults to a dict.
 
     Returns:
         multiplexed: Tuple[Generator] : effective copy of the
             original iterator as generators
     """
 
-    teepot = TeePot(iterator, n)
+    if buffer is None:
+        buffer = {}
+
+    teepot = TeePot(iterator, n, buffer=buffer)
 
     pot_manager = PotManager(teepot)
 
@@ -49,7 +57,8 @@ class TeePot:
         iterator: Iterator : base source of elements
         n_gen: int : number of generators
         n_yielded: int : number of the yielded elements
-        buffer: List[Any]: storage of the yielded elements
+        n_trimmed: int : number of elements removed from the buffer
+        buffer: MutableMapping[int, Any]: storage of the yielded elements
         generator_positions: Dict[int, int] : index of the last yielded
             element per generator
     """
@@ -60,7 +69,9 @@ class TeePot:
     
     n_yielded: int = 0
 
-    buffer: Dict[int, Any] = dataclasses.field(
+    n_trimmed: int = 0
+
+    buffer: MutableMapping[int, Any] = dataclasses.field(
         default_factory=dict
     )
     
@@ -121,6 +132,7 @@ class PotManager:
             self.teepot.buffer[pos] = element
             self.teepot.n_yielded += 1
             self.teepot.generator_positions[idx] = pos
+            self._trim_buffer(self.teepot)
 
             return element
 
@@ -147,12 +159,48 @@ class PotManager:
             None
         """
 
+        # no generators left => nothing to keep
+        if not teepot.generator_positions:
+            return
+
         pos_min = min(teepot.generator_positions.values())
-        positions_to_remove = [pos for pos in teepot.buffer if pos <= pos_min]
 
-        for pos in positions_to_remove:
+        # the buffer holds consecutive positions => remove the oldest ones
+        for pos in range(teepot.n_trimmed, pos_min + 1):
             del teepot.buffer[pos]
-        
+
+        teepot.n_trimmed = max(teepot.n_trimmed, pos_min + 1)
+
+    def unregister(self, idx: int) -> None:
+        """
+        Removes a generator from the bookkeeping. The elements only kept
+        for it are released. The underlying iterator and the buffer
+        are closed when the last generator is removed.
+
+        Parameters:
+            idx: int : id of the generator
+
+        Returns:
+            None
+        """
+
+        self.teepot.generator_positions.pop(idx, None)
+
+        if self.teepot.generator_positions:
+            self._trim_buffer(self.teepot)
+            return
+
+        # the last consumer is gone => stop the upstream
+        close = getattr(self.teepot.iterator, "close", None)
+        if close is not None:
+            close()
+
+        close = getattr(self.teepot.buffer, "close", None)
+        if close is not None:
+            close()
+        else:
+            self.teepot.buffer.clear()
+
 class TeeCup:
     """
     Class to mimic a generator which has copies.
@@ -176,12 +224,16 @@ class TeeCup:
         self.idx = idx
         self.pos = 0
         self.pot_manager = pot_manager
+        self.is_closed = False
 
     def __next__(self) -> Any:
         """
         Yields the subsequent element of a multiplexed generator.
         """
 
+        if self.is_closed:
+            raise StopIteration
+
         element = self.pot_manager.yield_next(self.idx, self.pos)
         self.pos = self.pos + 1
 
@@ -190,3 +242,30 @@ class TeeCup:
     def __iter__(self):
         """Make an iterator. Sufficient to return self."""
         return self
+
+    def close(self) -> None:
+        """
+        Stops the generator and releases the elements kept for it.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+
+        if not self.is_closed:
+            self.is_closed = True
+            self.pot_manager.unregister(self.idx)
+
+    def __enter__(self) -> "TeeCup":
+        """Closes the generator on leaving the context."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Closes the generator."""
+        self.close()
+
+    def __del__(self) -> None:
+        """An abandoned generator is closed."""
+        self.close()
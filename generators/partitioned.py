@@ -0,0 +1,346 @@
+"""
+Runs a pipeline over partitioned input in worker processes.
+"""
+
+import heapq
+import itertools
+import multiprocessing
+import multiprocessing.connection
+import traceback
+
+from typing import (
+    Any,
+    Callable,
+    Generator,
+    List,
+    Sequence
+)
+
+
+class PartitionError(RuntimeError):
+    """
+    Raised when a partition fails more times than allowed.
+    """
+
+
+def partitioned_executor(
+        partitions: Sequence[Any],
+        source: Callable,
+        pipeline: Callable,
+        merge: str = "round_robin",
+        key: Callable = None,
+        max_retries: int = 0,
+        chunk_size: int = 1024,
+        context: Any = None
+    ) -> Generator:
+    """
+    Creates a generator which runs the same pipeline over each partition
+    in a separate process and recombines the results.
+
+    A failed partition is restarted on its own. The elements it has
+    already sent are skipped on the retry, hence the pipeline
+    has to be deterministic for a partition.
+
+    Parameters:
+        partitions: Sequence[Any] : e.g. file names or key ranges
+        source: Callable : creates an iterator from a partition
+        pipeline: Callable : combinator chain applied to the iterator.
+            `source` and `pipeline` are sent to the workers so they must be
+            picklable, i.e. module level functions, not lambdas e.g.
+
+                def keep_valid(iterator):
+                    return filtr(iterator, is_valid)
+        merge: str = "round_robin" : how to recombine the partitions
+            "round_robin" : interlace like `merger`, exhausted
+                partitions are skipped
+            "key" : merge partitions sorted by `key` into a sorted stream
+            "unordered" : yield elements as they arrive
+        key: Callable = None : sort key of the "key" merge
+        max_retries: int = 0 : number of restarts allowed per partition
+        chunk_size: int = 1024 : number of elements sent at a time
+        context: Any = None : multiprocessing context, defaults to the
+            platform default
+
+    Yields:
+        element: Any : element from one of the partitions
+    """
+
+    if merge not in ("round_robin", "key", "unordered"):
+        raise ValueError(f"Unknown merge strategy: {merge}")
+
+    if context is None:
+        context = multiprocessing.get_context()
+
+    workers = [
+        _PartitionWorker(context, source, pipeline, partition, chunk_size)
+        for partition in partitions
+    ]
+
+    for worker in workers:
+        worker.start()
+
+    try:
+        if merge == "unordered":
+            yield from _merge_unordered(workers, max_retries)
+
+        else:
+            iterators = [
+                _partition_elements(worker, max_retries) for worker in workers
+            ]
+
+            if merge == "key":
+                yield from heapq.merge(*iterators, key=key)
+            else:
+                yield from _merge_round_robin(iterators)
+
+    finally:
+        for worker in workers:
+            worker.stop()
+
+
+class _PartitionWorker:
+    """
+    Process running the pipeline over a single partition and
+    the bookkeeping of what it has sent.
+    """
+
+    def __init__(
+            self,
+            context: Any,
+            source: Callable,
+            pipeline: Callable,
+            partition: Any,
+            chunk_size: int
+        ) -> None:
+        """
+        Sets up a worker without starting it.
+
+        Parameters:
+            context: Any : multiprocessing context
+            source: Callable : creates an iterator from a partition
+            pipeline: Callable : combinator chain
+            partition: Any : partition!
+            chunk_size: int : number of elements sent at a time
+
+        Returns:
+            None
+        """
+
+        self.context = context
+        self.source = source
+        self.pipeline = pipeline
+        self.partition = partition
+        self.chunk_size = chunk_size
+
+        self.n_received = 0
+        self.n_retries = 0
+        self.is_done = False
+
+        self.conn = None
+        self.process = None
+
+    def start(self) -> None:
+        """
+        Starts (or restarts) the worker process. The elements which
+        have already been received are skipped.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+
+        conn_recv, conn_send = self.context.Pipe(duplex=False)
+
+        self.process = self.context.Process(
+            target=_run_partition,
+            args=(
+                conn_send, self.source, self.pipeline, self.partition,
+                self.n_received, self.chunk_size
+            ),
+            daemon=True
+        )
+        self.process.start()
+
+        # only the child writes
+        conn_send.close()
+        self.conn = conn_recv
+
+    def stop(self) -> None:
+        """
+        Terminates the worker process.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+
+        if self.process is not None and self.process.is_alive():
+            self.process.terminate()
+        if self.process is not None:
+            self.process.join()
+        if self.conn is not None:
+            self.conn.close()
+
+    def receive(self, max_retries: int) -> List[Any]:
+        """
+        Receives the next chunk of elements. Restarts the
+        worker if it has failed.
+
+        Parameters:
+            max_retries: int : number of restarts allowed
+
+        Returns:
+            chunk: List[Any] : elements, empty if the partition is exhausted
+        """
+
+        while True:
+            try:
+                kind, payload = self.conn.recv()
+            except EOFError:
+                kind, payload = "error", "worker process exited unexpectedly"
+
+            if kind == "chunk":
+                self.n_received += len(payload)
+                return payload
+
+            if kind == "done":
+                self.is_done = True
+                self.stop()
+                return []
+
+            # failed => restart this partition only
+            self.stop()
+
+            if self.n_retries >= max_retries:
+                self.is_done = True
+                raise PartitionError(
+                    f"Partition {self.partition!r} failed "
+                    f"after {self.n_retries} retries:\n{payload}"
+                )
+
+            self.n_retries += 1
+            self.start()
+
+
+def _run_partition(
+        conn: Any,
+        source: Callable,
+        pipeline: Callable,
+        partition: Any,
+        n_skip: int,
+        chunk_size: int
+    ) -> None:
+    """
+    Worker process target. Sends the pipeline output in chunks.
+
+    Parameters:
+        conn: Any : sending end of a pipe
+        source: Callable : creates an iterator from a partition
+        pipeline: Callable : combinator chain
+        partition: Any : partition!
+        n_skip: int : number of elements sent by previous attempts
+        chunk_size: int : number of elements sent at a time
+
+    Returns:
+        None : sends ("chunk", elements), ("done", None)
+            or ("error", traceback) messages
+    """
+
+    try:
+        iterator = pipeline(source(partition))
+        iterator = itertools.islice(iterator, n_skip, None)
+
+        while True:
+            chunk = list(itertools.islice(iterator, chunk_size))
+            if not chunk:
+                break
+            conn.send(("chunk", chunk))
+
+        conn.send(("done", None))
+
+    except Exception:
+        conn.send(("error", traceback.format_exc()))
+
+    finally:
+        conn.close()
+
+
+def _partition_elements(
+        worker: _PartitionWorker,
+        max_retries: int
+    ) -> Generator:
+    """
+    Elementwise generator of the output of a worker.
+
+    Parameters:
+        worker: _PartitionWorker : worker!
+        max_retries: int : number of restarts allowed
+
+    Yields:
+        element: Any : element from the partition
+    """
+
+    while True:
+        chunk = worker.receive(max_retries)
+        if not chunk:
+            return
+        yield from chunk
+
+
+def _merge_round_robin(iterators: List[Generator]) -> Generator:
+    """
+    Interlaces iterators, skipping the exhausted ones.
+
+    Parameters:
+        iterators: List[Generator] : iterators!
+
+    Yields:
+        : Any : interlaced elements from the iterators
+    """
+
+    active = list(iterators)
+
+    while active:
+        exhausted = []
+        for iterator in active:
+            try:
+                yield next(iterator)
+            except StopIteration:
+                exhausted.append(iterator)
+
+        for iterator in exhausted:
+            active.remove(iterator)
+
+
+def _merge_unordered(
+        workers: List[_PartitionWorker],
+        max_retries: int
+    ) -> Generator:
+    """
+    Yields the chunks of the workers as they arrive.
+
+    Parameters:
+        workers: List[_PartitionWorker] : workers!
+        max_retries: int : number of restarts allowed
+
+    Yields:
+        element: Any : element from one of the partitions
+    """
+
+    active = [worker for worker in workers if not worker.is_done]
+
+    while active:
+        ready = multiprocessing.connection.wait(
+            [worker.conn for worker in active]
+        )
+
+        for worker in active:
+            # a restarted worker has a new connection => wait for it again
+            if worker.conn in ready:
+                yield from worker.receive(max_retries)
+
+        active = [worker for worker in active if not worker.is_done]
@@ -0,0 +1,240 @@
+"""
+Columnar record batches and their batch level combinators.
+"""
+
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    List
+)
+
+
+class RecordBatch:
+    """
+    Table of equal length numpy columns. Slices share memory
+    with the original batch.
+    """
+
+    __slots__ = ("columns", "length")
+
+    def __init__(self, columns: Dict[str, Any]) -> None:
+        """
+        Creates a batch from columns.
+
+        Parameters:
+            columns: Dict[str, np.ndarray] : name => column
+
+        Returns:
+            None
+        """
+
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns of different lengths: {sorted(lengths)}")
+
+        self.columns = columns
+        self.length = lengths.pop() if lengths else 0
+
+    def __len__(self) -> int:
+        """Number of records."""
+        return self.length
+
+    def __getitem__(self, key: Any) -> Any:
+        """
+        Selects a column by name or records by slice, mask or indices.
+
+        Parameters:
+            key: Any : column name, slice (view), boolean mask
+                or integer array (copy)
+
+        Returns:
+            : Any : column or record batch
+        """
+
+        if isinstance(key, str):
+            return self.columns[key]
+
+        return RecordBatch(
+            {name: column[key] for name, column in self.columns.items()}
+        )
+
+    def __repr__(self) -> str:
+        """Column names and length."""
+        return f"RecordBatch({list(self.columns)}, length={self.length})"
+
+    def rows(self) -> Iterator:
+        """
+        Elementwise view of the batch for the elementwise combinators.
+
+        Parameters:
+            None
+
+        Returns:
+            : Iterator : tuples of the column values of each record
+        """
+
+        return zip(*(column.tolist() for column in self.columns.values()))
+
+    @classmethod
+    def concat(cls, batches: List["RecordBatch"]) -> "RecordBatch":
+        """
+        Concatenates batches with identical columns.
+
+        Parameters:
+            batches: List[RecordBatch] : batches!
+
+        Returns:
+            : RecordBatch : concatenated batch
+        """
+
+        import numpy as np
+
+        if len(batches) == 1:
+            return batches[0]
+
+        names = batches[0].columns.keys()
+
+        return cls({
+            name: np.concatenate([batch.columns[name] for batch in batches])
+            for name in names
+        })
+
+
+def filtr_batches(batches: Iterator, cond: Callable) -> Generator:
+    """
+    Batch level `filtr`. Only those records are kept
+    at which the condition evaluates to true.
+
+    Parameters:
+        batches: Iterator : record batches
+        cond: Callable : returns a boolean mask when called on a batch
+            e.g. `lambda batch: batch["x"] > 0`
+
+    Yields:
+        batch: RecordBatch : batch of the selected records, empty
+            batches are skipped
+    """
+
+    for batch in batches:
+        selected = batch[cond(batch)]
+        if len(selected):
+            yield selected
+
+
+def thinner_batches(batches: Iterator, n: int) -> Generator:
+    """
+    Batch level `thinner`. Selects every n-th record of the stream
+    (counted across batches) with strided views.
+
+    Parameters:
+        batches: Iterator : record batches
+        n: int : n-th records are yielded
+
+    Yields:
+        batch: RecordBatch : view of the selected records
+    """
+
+    # number of records seen in the previous batches
+    offset = 0
+
+    for batch in batches:
+        start = (-offset) % n
+        offset += len(batch)
+
+        selected = batch[start::n]
+        if len(selected):
+            yield selected
+
+
+def compressor_batches(batches: Iterator, selectors: Iterator) -> Generator:
+    """
+    Batch level `compressor`. A record is kept when its selector is true.
+
+    Parameters:
+        batches: Iterator : record batches
+        selectors: Iterator : boolean masks, one per batch
+
+    Yields:
+        batch: RecordBatch : batch of the selected records
+    """
+
+    for batch, selector in zip(batches, selectors):
+        selected = batch[selector]
+        if len(selected):
+            yield selected
+
+
+def zipper_batches(*batch_iterators) -> Generator:
+    """
+    Batch level `zipper`. Concatenates the columns of aligned batches.
+
+    Parameters:
+        batch_iterators: Any : iterators of record batches of
+            equal lengths and distinct column names
+
+    Yields:
+        batch: RecordBatch : batch with the columns of all inputs
+    """
+
+    for batches in zip(*batch_iterators):
+        columns = {}
+        for batch in batches:
+            columns.update(batch.columns)
+
+        yield RecordBatch(columns)
+
+
+def make_batcher_batches(
+        batches: Iterator,
+        n: int,
+        strict: bool = True
+    ) -> Generator:
+    """
+    Batch level `make_batcher`. Re-chunks record batches to batches of
+    n records. Records are only copied when a batch spans input batches.
+
+    Parameters:
+        batches: Iterator : record batches
+        n: int : number of records in a batch
+        strict: bool = True : whether to raise on a last
+            batch shorter than n
+
+    Yields:
+        batch: RecordBatch : n records
+    """
+
+    pending = []
+    n_pending = 0
+
+    for batch in batches:
+        start = 0
+
+        # complete the pending batch
+        if n_pending:
+            n_take = min(n - n_pending, len(batch))
+            pending.append(batch[:n_take])
+            n_pending += n_take
+            start = n_take
+
+            if n_pending < n:
+                continue
+
+            yield RecordBatch.concat(pending)
+            pending, n_pending = [], 0
+
+        # full batches are views
+        while len(batch) - start >= n:
+            yield batch[start:start + n]
+            start += n
+
+        if start < len(batch):
+            pending.append(batch[start:])
+            n_pending = len(batch) - start
+
+    if n_pending:
+        if strict:
+            raise ValueError(f"Last batch has {n_pending} records instead of {n}.")
+        yield RecordBatch.concat(pending)
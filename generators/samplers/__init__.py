@@ -0,0 +1,12 @@
+"""
+Samplers built from the generator combinators.
+"""
+
+from .mixture import (
+    class_sampler,
+    cycle_cached,
+    load_sample_plan,
+    make_sample_plan,
+    renormalise_counts,
+    replay_sample_plan
+)
@@ -2,28 +2,38 @@
 
 """
 
+import os
+import tempfile
+
 from typing import (
+    Any,
     Generator,
     Iterator,
     List,
     Tuple
 )
 
-import numpy as np
-
-from src.generators.batches import (
+from ..batches import (
     make_batcher,
     serialiser
 )
 
-from src.generators.multi_input import (
+from ..multi_input import (
     switcher
 )
 
 
+# marks an exhausted class
+_EXHAUSTED = object()
+
+
 def class_sampler(
         iterators: Tuple[Iterator],
-        counts: Tuple[int]
+        counts: Tuple[int],
+        plan: Any = None,
+        exhausted: str = "stop",
+        seed: int = None,
+        cache_directory: str = None
     ) -> Generator:
     """
     Creates a generator of samples where each sample
@@ -34,17 +44,55 @@ def class_sampler(
         generators: Tuple[Generator] : individuals by class
         counts: Tuple[int] : how many individual per class
             should be in a sample
+        plan: np.ndarray = None : precomputed class indices of the samples
+            from `make_sample_plan`, which are replayed instead of
+            drawing a new order. Sampling ends with the plan.
+        exhausted: str = "stop" : what happens when a class runs out
+            "stop": sampling ends
+            "cycle": the class is replayed from a cache in a new
+                random order, see `cycle_cached`
+            "drop": the class is left out and the counts of the other
+                classes are scaled up to the sample size (not with a plan)
+        seed: int = None : seed of the cycle and drop shuffles
+        cache_directory: str = None : if given, cycled classes are cached
+            in memory mapped files in this directory instead of lists
 
     Returns:
-        samples: Generator : sample generator
+        samples: Generator : sample generator, each sample is a generator
+            of individuals under every policy
     """
 
-    # first create a generator of class indices
-    # each class appears the required number of times in each batch
-    index_batches = generate_sample_index_batches(counts)
+    if exhausted == "drop":
+        if plan is not None:
+            raise ValueError("A plan cannot be replayed when classes are dropped.")
+        return _dropping_class_sampler(iterators, counts, seed)
+
+    if exhausted == "cycle":
+        import numpy as np
+
+        seeds = np.random.SeedSequence(seed).spawn(len(iterators))
+        iterators = tuple(
+            cycle_cached(iterator, np.random.default_rng(seed_class), cache_directory)
+            for iterator, seed_class in zip(iterators, seeds)
+        )
 
-    # concatenate the batches so we can pass it to existing functions
-    index_series = serialiser(index_batches)
+    elif exhausted != "stop":
+        raise ValueError(f"Unknown exhausted class policy: {exhausted}")
+
+    if plan is None:
+        # first create a generator of class indices
+        # each class appears the required number of times in each batch
+        index_batches = generate_sample_index_batches(counts)
+
+        # concatenate the batches so we can pass it to existing functions
+        index_series = serialiser(index_batches)
+
+    else:
+        if plan.ndim != 2 or plan.shape[1] != sum(counts):
+            raise ValueError(
+                f"Plan of shape {plan.shape} does not match the sample size {sum(counts)}."
+            )
+        index_series = replay_sample_plan(plan)
 
     # contiguous samples
     gen_sample = switcher(iterators, index_series)
@@ -90,6 +138,9 @@ def sample_multiset_no_replacement(bookkeep: Tuple[int]) -> Generator:
         : int : class of the individual
     """
 
+    # deferred so that importing the package does not load numpy
+    import numpy as np
+
     n = len(bookkeep)
 
     # until all elements are taken
@@ -131,3 +182,260 @@ def make_bookkeep(counts: Tuple[int]) -> List[int]:
         bookkeep.append(bookkeep[- 1] + count)
 
     return bookkeep
+
+
+def make_sample_plan(
+        counts: Tuple[int],
+        n_sample: int,
+        seed: int = None,
+        path: str = None,
+        chunk_size: int = 65536
+    ) -> Any:
+    """
+    Draws the class indices of a number of samples (e.g. an epoch)
+    in one go. Each row is an independent permutation of the multiset
+    given by the counts, i.e. it has the same distribution as
+    `generate_sample_index_batches`. The same seed gives the same plan
+    on every machine.
+
+    Parameters:
+        counts: Tuple[int] : number of individiduals per class per sample
+        n_sample: int : number of samples
+        seed: int = None : seed of the random generator
+        path: str = None : if given, the plan is written to this .npy file
+            and returned as a memory map
+        chunk_size: int = 65536 : number of samples permuted at once
+
+    Returns:
+        plan: np.ndarray : (n_sample, sum(counts)) class indices,
+            int8 up to 128 classes, int16 above
+    """
+
+    import numpy as np
+
+    if len(counts) <= 128:
+        dtype = np.int8
+    elif len(counts) <= 32768:
+        dtype = np.int16
+    else:
+        raise ValueError(f"Too many classes for a plan: {len(counts)}")
+
+    rng = np.random.default_rng(seed)
+
+    shape = (n_sample, sum(counts))
+    if path is None:
+        plan = np.empty(shape, dtype=dtype)
+    else:
+        plan = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+
+    sample = np.repeat(np.arange(len(counts), dtype=dtype), counts)
+
+    for start in range(0, n_sample, chunk_size):
+        stop = min(start + chunk_size, n_sample)
+        plan[start:stop] = rng.permuted(
+            np.broadcast_to(sample, (stop - start, len(sample))), axis=1
+        )
+
+    if path is not None:
+        plan.flush()
+
+    return plan
+
+
+def load_sample_plan(path: str) -> Any:
+    """
+    Memory maps a plan written by `make_sample_plan`.
+
+    Parameters:
+        path: str : path to the .npy file
+
+    Returns:
+        plan: np.memmap : (n_sample, sample size) class indices
+    """
+
+    import numpy as np
+
+    return np.load(path, mmap_mode="r")
+
+
+def replay_sample_plan(
+        plan: Any,
+        chunk_size: int = 4096
+    ) -> Generator:
+    """
+    Generator of the class indices of a plan. The plan is read in
+    chunks of samples, so memory mapped plans are not loaded at once.
+
+    Parameters:
+        plan: np.ndarray : (n_sample, sample size) class indices
+        chunk_size: int = 4096 : number of samples converted at once
+
+    Yields:
+        : int : class of the individual
+    """
+
+    for start in range(0, len(plan), chunk_size):
+        yield from plan[start:start + chunk_size].ravel().tolist()
+
+
+def cycle_cached(
+        iterator: Iterator,
+        rng: Any = None,
+        directory: str = None,
+        chunk_size: int = 4096
+    ) -> Generator:
+    """
+    Creates a generator which passes the elements of an iterator through
+    while caching them, then endlessly repeats the cache, each cycle in
+    a new random order. The source is read only once.
+
+    Parameters:
+        iterator: Iterator : iterator!
+        rng: Any = None : numpy random generator or seed
+        directory: str = None : if given, the elements, which have to be
+            numpy arrays (or scalars) of the same dtype and shape, are
+            cached in a memory mapped file in this directory, otherwise
+            in a list
+        chunk_size: int = 4096 : number of elements gathered at once
+            from a memory mapped cache
+
+    Yields:
+        element: Any : element! Nothing is repeated for an empty iterator.
+    """
+
+    import numpy as np
+
+    rng = np.random.default_rng(rng)
+
+    if directory is None:
+        cache = []
+        for element in iterator:
+            cache.append(element)
+            yield element
+
+        if not cache:
+            return
+
+        while True:
+            for i in rng.permutation(len(cache)).tolist():
+                yield cache[i]
+
+    fd, path = tempfile.mkstemp(prefix="class-cache-", dir=directory)
+    try:
+        n = 0
+        with os.fdopen(fd, "wb") as fp:
+            for element in iterator:
+                if not n:
+                    dtype, shape = np.asarray(element).dtype, np.shape(element)
+                fp.write(np.ascontiguousarray(element, dtype=dtype).tobytes())
+                n += 1
+                yield element
+
+        if not n:
+            return
+
+        cache = np.memmap(path, dtype=dtype, mode="r", shape=(n,) + shape)
+
+        while True:
+            order = rng.permutation(n)
+            for start in range(0, n, chunk_size):
+                # gather a chunk with one fancy indexing operation
+                yield from cache[order[start:start + chunk_size]]
+
+    finally:
+        os.remove(path)
+
+
+def _dropping_class_sampler(
+        iterators: Tuple[Iterator],
+        counts: Tuple[int],
+        seed: int = None
+    ) -> Generator:
+    """
+    Generator of samples which leaves out exhausted classes.
+    The elements of the sample in which a class runs out are kept and
+    the rest of the sample is filled by the remaining classes in the
+    renormalised proportions. No sample is longer than the sample size,
+    the last one can be shorter.
+
+    Parameters:
+        iterators: Tuple[Iterator] : individuals by class
+        counts: Tuple[int] : how many individual per class
+            should be in a sample
+        seed: int = None : seed of the random generator
+
+    Yields:
+        sample: Generator : individuals of a sample
+    """
+
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    classes = np.arange(len(counts))
+
+    n_sample = sum(counts)
+    weights = list(counts)
+    counts = list(counts)
+
+    while any(weights):
+        sample = []
+        n_drawn = [0] * len(counts)
+        n_todo = counts
+
+        while any(n_todo):
+            for i_class in rng.permutation(np.repeat(classes, n_todo)).tolist():
+                element = next(iterators[i_class], _EXHAUSTED)
+
+                if element is _EXHAUSTED:
+                    weights[i_class] = 0
+                    counts = renormalise_counts(weights, n_sample)
+                    break
+
+                sample.append(element)
+                n_drawn[i_class] += 1
+            else:
+                break
+
+            # the slots not taken by dropped classes are shared
+            # by the remaining ones
+            n_dropped = sum(n for n, weight in zip(n_drawn, weights) if not weight)
+            counts_sample = renormalise_counts(weights, n_sample - n_dropped)
+            n_todo = [max(count - n, 0) for count, n in zip(counts_sample, n_drawn)]
+
+            # a class drawn above its new count takes slots of the others
+            n_excess = sum(n_todo) - (n_sample - len(sample))
+            for _ in range(n_excess):
+                n_todo[n_todo.index(max(n_todo))] -= 1
+
+        # a generator like the batches of the other policies
+        if sample:
+            yield (element for element in sample)
+
+
+def renormalise_counts(weights: Tuple[int], n: int) -> List[int]:
+    """
+    Scales counts to a given total. The remainders are assigned
+    by the largest fractional parts.
+
+    Parameters:
+        weights: Tuple[int] : counts in the original proportions
+        n: int : total of the new counts
+
+    Returns:
+        counts: List[int] : new counts, all zero if the weights are
+    """
+
+    total = sum(weights)
+    if not total:
+        return [0] * len(weights)
+
+    quotas = [weight * n / total for weight in weights]
+    counts = [int(quota) for quota in quotas]
+
+    by_fraction = sorted(
+        range(len(weights)), key=lambda i: counts[i] - quotas[i]
+    )
+    for i in by_fraction[:n - sum(counts)]:
+        counts[i] += 1
+
+    return counts
@@ -0,0 +1,605 @@
+"""
+Constant memory summaries of streams: counts, cardinality and quantiles.
+"""
+
+import array
+import math
+import random
+import struct
+
+from typing import (
+    Any,
+    Iterator,
+    List
+)
+
+from .distinct import (
+    hash_array,
+    hash_key
+)
+
+
+_MASK64 = (1 << 64) - 1
+
+
+def sketch_sink(
+        iterator: Iterator,
+        sketch: Any,
+        chunked: bool = False
+    ) -> Any:
+    """
+    Consumes an iterator into a sketch.
+
+    Parameters:
+        iterator: Iterator : elements or numpy chunks of elements
+        sketch: Any : sketch with `update` and `update_many` methods
+        chunked: bool = False : whether the iterator yields chunks
+
+    Returns:
+        sketch: Any : the updated sketch
+    """
+
+    if chunked:
+        for chunk in iterator:
+            sketch.update_many(chunk)
+    else:
+        for element in iterator:
+            sketch.update(element)
+
+    return sketch
+
+
+def hash_element(element: Any) -> int:
+    """
+    Hashes an element to 64 bits. Integers and floats are hashed
+    as their 64 bit and float64 representation so that they are
+    consistent with `hash_chunk` (uint64 values wrap to int64 there,
+    their bits are the same).
+
+    Parameters:
+        element: Any : element!
+
+    Returns:
+        : int : 64 bit hash
+    """
+
+    if isinstance(element, float):
+        word = struct.unpack("<Q", struct.pack("<d", element))[0]
+    elif isinstance(element, int) and -(1 << 63) <= element < (1 << 64):
+        word = element & _MASK64
+    elif type(element).__module__ == "numpy" and hasattr(element, "item"):
+        return hash_element(element.item())
+    else:
+        return hash_key(element)
+
+    return _splitmix64(word)
+
+
+def hash_chunk(chunk: Any) -> Any:
+    """
+    Hashes a numeric numpy chunk to 64 bit integers.
+
+    Parameters:
+        chunk: np.ndarray : 1D array of integers or floats
+
+    Returns:
+        : np.ndarray : uint64 hashes
+    """
+
+    import numpy as np
+
+    chunk = np.asarray(chunk)
+
+    if chunk.dtype.kind in "biu":
+        chunk = chunk.astype(np.int64)
+    elif chunk.dtype.kind == "f":
+        chunk = chunk.astype(np.float64)
+    else:
+        # no vectorised counterpart => hash elementwise
+        return np.fromiter(
+            (hash_element(element) for element in chunk.tolist()),
+            dtype=np.uint64, count=len(chunk)
+        )
+
+    return hash_array(chunk)
+
+
+def _splitmix64(x: int) -> int:
+    """
+    Pure python counterpart of the vectorised splitmix64 finaliser
+    with a zero initial state.
+
+    Parameters:
+        x: int : 64 bit word
+
+    Returns:
+        : int : 64 bit hash
+    """
+
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+
+    return x ^ (x >> 31)
+
+
+class CountMinSketch:
+    """
+    Approximate counts of elements. The counts are overestimated by
+    at most `epsilon` times the total count with a probability
+    of 1 - `delta`.
+    """
+
+    def __init__(self, epsilon: float = 0.001, delta: float = 0.01) -> None:
+        """
+        Sizes the counter table.
+
+        Parameters:
+            epsilon: float = 0.001 : relative error of the counts
+            delta: float = 0.01 : probability of exceeding the error
+
+        Returns:
+            None
+        """
+
+        self.width = math.ceil(math.e / epsilon)
+        self.depth = math.ceil(math.log(1 / delta))
+
+        # rows of counters in a single flat buffer
+        self.table = array.array("q", bytes(8 * self.width * self.depth))
+        self.n = 0
+
+    def _columns(self, h: int) -> List[int]:
+        """
+        Flat indices of the counters of a hash, one per row.
+
+        Parameters:
+            h: int : 64 bit hash
+
+        Returns:
+            : List[int] : counter indices
+        """
+
+        h1 = h & 0xFFFFFFFF
+        h2 = (h >> 32) | 1
+
+        return [
+            i * self.width + (h1 + i * h2) % self.width
+            for i in range(self.depth)
+        ]
+
+    def update(self, element: Any, count: int = 1) -> None:
+        """
+        Adds an element.
+
+        Parameters:
+            element: Any : element!
+            count: int = 1 : number of occurences
+
+        Returns:
+            None
+        """
+
+        table = self.table
+        for i in self._columns(hash_element(element)):
+            table[i] += count
+
+        self.n += count
+
+    def update_many(self, chunk: Any) -> None:
+        """
+        Adds the elements of a numpy chunk.
+
+        Parameters:
+            chunk: np.ndarray : 1D array of elements
+
+        Returns:
+            None
+        """
+
+        import numpy as np
+
+        hashes = hash_chunk(chunk)
+        table = np.frombuffer(self.table, dtype=np.int64)
+
+        h1 = (hashes & np.uint64(0xFFFFFFFF)).astype(np.int64)
+        h2 = ((hashes >> np.uint64(32)) | np.uint64(1)).astype(np.int64)
+
+        for i in range(self.depth):
+            columns = i * self.width + (h1 + i * h2) % self.width
+            np.add.at(table, columns, 1)
+
+        self.n += len(hashes)
+
+    def estimate(self, element: Any) -> int:
+        """
+        Estimates the count of an element.
+
+        Parameters:
+            element: Any : element!
+
+        Returns:
+            : int : upper estimate of the count
+        """
+
+        return min(self.table[i] for i in self._columns(hash_element(element)))
+
+    def merge(self, other: "CountMinSketch") -> "CountMinSketch":
+        """
+        Adds the counts of another sketch of the same size.
+
+        Parameters:
+            other: CountMinSketch : sketch e.g. from another worker
+
+        Returns:
+            self: CountMinSketch : merged sketch
+        """
+
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("Sketches of different sizes cannot be merged.")
+
+        table = self.table
+        for i, count in enumerate(other.table):
+            table[i] += count
+
+        self.n += other.n
+
+        return self
+
+
+class HyperLogLog:
+    """
+    Approximate number of distinct elements. The relative standard
+    error is about 1.04 / sqrt(2 ** precision).
+    """
+
+    def __init__(self, precision: int = 14) -> None:
+        """
+        Creates the registers.
+
+        Parameters:
+            precision: int = 14 : number of index bits
+
+        Returns:
+            None
+        """
+
+        if not 4 <= precision <= 18:
+            raise ValueError("Precision must be between 4 and 18.")
+
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+
+    def update(self, element: Any) -> None:
+        """
+        Adds an element.
+
+        Parameters:
+            element: Any : element!
+
+        Returns:
+            None
+        """
+
+        h = hash_element(element)
+        n_rest = 64 - self.precision
+
+        idx = h >> n_rest
+        rank = n_rest - (h & ((1 << n_rest) - 1)).bit_length() + 1
+
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def update_many(self, chunk: Any) -> None:
+        """
+        Adds the elements of a numpy chunk.
+
+        Parameters:
+            chunk: np.ndarray : 1D array of elements
+
+        Returns:
+            None
+        """
+
+        import numpy as np
+
+        hashes = hash_chunk(chunk)
+        n_rest = 64 - self.precision
+
+        idx = (hashes >> np.uint64(n_rest)).astype(np.int64)
+        rest = hashes & np.uint64((1 << n_rest) - 1)
+
+        # bit length from the float exponent, corrected for rounding up
+        bit_length = np.frexp(rest.astype(np.float64))[1].astype(np.int64)
+        rounded_up = (bit_length > 0) & (
+            np.left_shift(np.uint64(1), np.maximum(bit_length - 1, 0).astype(np.uint64)) > rest
+        )
+        bit_length -= rounded_up
+
+        rank = (n_rest - bit_length + 1).astype(np.uint8)
+
+        registers = np.frombuffer(self.registers, dtype=np.uint8)
+        np.maximum.at(registers, idx, rank)
+
+    def estimate(self) -> float:
+        """
+        Estimates the number of distinct elements.
+
+        Parameters:
+            None
+
+        Returns:
+            : float : cardinality estimate
+        """
+
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+
+        # small range correction => linear counting
+        n_zero = self.registers.count(0)
+        if estimate <= 2.5 * m and n_zero:
+            estimate = m * math.log(m / n_zero)
+
+        return estimate
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """
+        Takes the union with another sketch of the same precision.
+
+        Parameters:
+            other: HyperLogLog : sketch e.g. from another worker
+
+        Returns:
+            self: HyperLogLog : merged sketch
+        """
+
+        if self.precision != other.precision:
+            raise ValueError("Sketches of different precisions cannot be merged.")
+
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+        return self
+
+
+class KLLSketch:
+    """
+    Approximate quantiles of comparable elements (KLL sketch).
+    Elements are kept in a hierarchy of compactors. An element
+    at level h represents 2 ** h elements of the stream. A full
+    compactor is sorted and every other element is promoted.
+    """
+
+    def __init__(self, k: int = 200, seed: int = None) -> None:
+        """
+        Creates an empty sketch.
+
+        Parameters:
+            k: int = 200 : size of the top compactor, controls the accuracy
+            seed: int = None : seed of the compaction offsets
+
+        Returns:
+            None
+        """
+
+        self.k = k
+        self.rng = random.Random(seed)
+
+        self.compactors: List[List[Any]] = []
+        self.size = 0
+        self.max_size = 0
+        self.n = 0
+
+        self._grow()
+
+    def _capacity(self, h: int) -> int:
+        """
+        Capacity of the compactor at a level.
+
+        Parameters:
+            h: int : level
+
+        Returns:
+            : int : capacity
+        """
+
+        depth = len(self.compactors) - h - 1
+
+        return int(math.ceil(self.k * (2 / 3) ** depth)) + 1
+
+    def _grow(self) -> None:
+        """
+        Adds a compactor on top.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+
+        self.compactors.append([])
+        self.max_size = sum(
+            self._capacity(h) for h in range(len(self.compactors))
+        )
+
+    def _compact(self, items: List[Any]) -> List[Any]:
+        """
+        Halves a compactor. Sorts it and selects every other element
+        starting at a random offset. The last element of an odd
+        number of elements is kept.
+
+        Parameters:
+            items: List[Any] : elements of the compactor (modified in place)
+
+        Returns:
+            promoted: List[Any] : elements to add to the next level
+        """
+
+        items.sort()
+
+        kept = [items.pop()] if len(items) % 2 else []
+        promoted = items[self.rng.random() < 0.5::2]
+
+        items[:] = kept
+
+        return promoted
+
+    def _compress(self) -> None:
+        """
+        Compacts full compactors until the sketch fits its size.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+
+        while self.size >= self.max_size:
+            for h, items in enumerate(self.compactors):
+                if len(items) >= self._capacity(h):
+                    if h + 1 >= len(self.compactors):
+                        self._grow()
+                    self.compactors[h + 1].extend(self._compact(items))
+                    break
+            else:
+                return
+
+            self.size = sum(len(items) for items in self.compactors)
+
+    def update(self, element: Any) -> None:
+        """
+        Adds an element.
+
+        Parameters:
+            element: Any : element!
+
+        Returns:
+            None
+        """
+
+        self.compactors[0].append(element)
+        self.size += 1
+        self.n += 1
+
+        if self.size >= self.max_size:
+            self._compress()
+
+    def update_many(self, chunk: Any) -> None:
+        """
+        Adds the elements of a numpy chunk. Large chunks are
+        compacted with numpy before they are added to the compactors.
+
+        Parameters:
+            chunk: np.ndarray : 1D array of elements
+
+        Returns:
+            None
+        """
+
+        import numpy as np
+
+        values = np.sort(np.asarray(chunk))
+        self.n += len(values)
+
+        h = 0
+        while len(values) > self._capacity(h):
+            if h + 1 >= len(self.compactors):
+                self._grow()
+
+            if len(values) % 2:
+                self.compactors[h].append(values[-1].item())
+                values = values[:-1]
+
+            values = values[self.rng.random() < 0.5::2]
+            h += 1
+
+        self.compactors[h].extend(values.tolist())
+        self.size = sum(len(items) for items in self.compactors)
+        self._compress()
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """
+        Adds the elements of another sketch.
+
+        Parameters:
+            other: KLLSketch : sketch e.g. from another worker
+
+        Returns:
+            self: KLLSketch : merged sketch
+        """
+
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+
+        for h, items in enumerate(other.compactors):
+            self.compactors[h].extend(items)
+
+        self.n += other.n
+        self.size = sum(len(items) for items in self.compactors)
+        self._compress()
+
+        return self
+
+    def _weighted_items(self) -> List[Any]:
+        """
+        Sorted elements with their weights.
+
+        Parameters:
+            None
+
+        Returns:
+            : List[Tuple[Any, int]] : (element, weight) pairs
+        """
+
+        return sorted(
+            (item, 1 << h)
+            for h, items in enumerate(self.compactors) for item in items
+        )
+
+    def quantile(self, q: float) -> Any:
+        """
+        Estimates a quantile.
+
+        Parameters:
+            q: float : quantile in [0, 1]
+
+        Returns:
+            : Any : element at the quantile, None if the sketch is empty
+        """
+
+        items = self._weighted_items()
+        if not items:
+            return None
+
+        total = sum(weight for _, weight in items)
+        target = q * total
+
+        cumulative = 0
+        for item, weight in items:
+            cumulative += weight
+            if cumulative >= target:
+                return item
+
+        return items[-1][0]
+
+    def rank(self, element: Any) -> float:
+        """
+        Estimates the fraction of elements not greater than an element.
+
+        Parameters:
+            element: Any : element!
+
+        Returns:
+            : float : normalised rank
+        """
+
+        items = self._weighted_items()
+        total = sum(weight for _, weight in items)
+        if not total:
+            return 0.0
+
+        return sum(weight for item, weight in items if item <= element) / total
@@ -0,0 +1,409 @@
+"""
+Tiered buffer which pages old elements to temporary files.
+"""
+
+import bisect
+import collections
+import os
+import pickle
+import tempfile
+
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Iterator,
+    List,
+    Tuple
+)
+
+
+class PickleSerialiser:
+    """
+    Serialises a segment of arbitrary elements as a pickled list.
+    """
+
+    @staticmethod
+    def dump(elements: List[Any], fp: BinaryIO) -> None:
+        """
+        Writes elements to a file.
+
+        Parameters:
+            elements: List[Any] : elements of a segment
+            fp: BinaryIO : file opened for writing
+
+        Returns:
+            None
+        """
+
+        pickle.dump(elements, fp, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(fp: BinaryIO) -> List[Any]:
+        """
+        Reads a segment of elements from a file.
+
+        Parameters:
+            fp: BinaryIO : file opened for reading
+
+        Returns:
+            elements: List[Any] : elements of the segment
+        """
+
+        return pickle.load(fp)
+
+
+class ArraySerialiser:
+    """
+    Serialises a segment of fixed dtype and shape elements
+    (numpy scalars or arrays) as a single raw buffer.
+    """
+
+    def __init__(self, dtype: Any, shape: Tuple[int] = ()) -> None:
+        """
+        Sets the element layout.
+
+        Parameters:
+            dtype: Any : numpy dtype of the elements
+            shape: Tuple[int] = () : shape of an element
+
+        Returns:
+            None
+        """
+
+        self.dtype = dtype
+        self.shape = tuple(shape)
+
+    def dump(self, elements: List[Any], fp: BinaryIO) -> None:
+        """
+        Writes elements to a file as a contiguous array.
+
+        Parameters:
+            elements: List[Any] : elements of a segment
+            fp: BinaryIO : file opened for writing
+
+        Returns:
+            None
+        """
+
+        import numpy as np
+
+        fp.write(np.ascontiguousarray(elements, dtype=self.dtype))
+
+    def load(self, fp: BinaryIO) -> Any:
+        """
+        Reads a segment of elements from a file.
+
+        Parameters:
+            fp: BinaryIO : file opened for reading
+
+        Returns:
+            elements: np.ndarray : elements of the segment along axis 0
+        """
+
+        import numpy as np
+
+        return np.fromfile(fp, dtype=self.dtype).reshape((-1,) + self.shape)
+
+
+class SpillBuffer:
+    """
+    Buffer of consecutively indexed elements. The most recent elements
+    are kept in memory, older ones are written to temporary files
+    in segments. Elements are added and removed in order
+    i.e. it is a queue with random read access.
+    When a segment is read back, the next one is read ahead
+    in a background thread.
+    """
+
+    def __init__(
+            self,
+            n_memory: int = 65536,
+            segment_size: int = 65536,
+            serialiser: Any = None,
+            n_cached: int = 2,
+            directory: str = None,
+            read_ahead: bool = True
+        ) -> None:
+        """
+        Creates an empty buffer.
+
+        Parameters:
+            n_memory: int = 65536 : number of recent elements kept in memory
+            segment_size: int = 65536 : number of elements in a file
+            serialiser: Any = None : object with `dump` and `load` methods,
+                defaults to `PickleSerialiser`
+            n_cached: int = 2 : number of segments read back kept in memory,
+                about the number of lagging consumers
+            directory: str = None : where to create the files,
+                defaults to the system temporary directory
+            read_ahead: bool = True : whether to read the segment following
+                a loaded one in the background
+
+        Returns:
+            None
+        """
+
+        self.n_memory = n_memory
+        self.segment_size = segment_size
+        self.serialiser = serialiser or PickleSerialiser()
+        self.n_cached = n_cached
+        self.directory = directory
+        self.read_ahead = read_ahead
+
+        # recent elements
+        self.memory: Dict[int, Any] = {}
+
+        # spilled segments in order: start positions and file paths
+        self.segment_starts: List[int] = []
+        self.segment_paths: List[str] = []
+
+        # segments read back from file keyed by their start position
+        self.cache = collections.OrderedDict()
+
+        # segments being read ahead keyed by their start position
+        self.pending: Dict[int, Any] = {}
+        self.executor = None
+
+        # positions in the buffer [pos_low, pos_next)
+        self.pos_low = 0
+        self.pos_memory = 0
+        self.pos_next = 0
+
+    def __setitem__(self, pos: int, element: Any) -> None:
+        """
+        Appends an element to the buffer.
+
+        Parameters:
+            pos: int : position of the element, must be the next one
+            element: Any : element!
+
+        Returns:
+            None
+        """
+
+        if pos != self.pos_next:
+            raise IndexError(
+                f"Elements must be added in order. Expected {self.pos_next}, got {pos}."
+            )
+
+        self.memory[pos] = element
+        self.pos_next += 1
+
+        if len(self.memory) >= self.n_memory + self.segment_size:
+            self._spill()
+
+    def __getitem__(self, pos: int) -> Any:
+        """
+        Retrieves an element from memory or file.
+
+        Parameters:
+            pos: int : position of the element
+
+        Returns:
+            element: Any : element!
+        """
+
+        if pos >= self.pos_memory:
+            return self.memory[pos]
+
+        if pos < self.pos_low:
+            raise KeyError(pos)
+
+        i_segment = bisect.bisect_right(self.segment_starts, pos) - 1
+        start = self.segment_starts[i_segment]
+
+        return self._load_segment(i_segment)[pos - start]
+
+    def __delitem__(self, pos: int) -> None:
+        """
+        Removes the oldest element from the buffer.
+
+        Parameters:
+            pos: int : position of the element, must be the oldest one
+
+        Returns:
+            None
+        """
+
+        if pos != self.pos_low:
+            raise KeyError(pos)
+
+        self.pos_low += 1
+
+        if pos >= self.pos_memory:
+            # no segments are left => the memory starts at the oldest element
+            del self.memory[pos]
+            self.pos_memory = self.pos_low
+            return
+
+        # the oldest segment has been passed by all readers
+        if len(self.segment_starts) > 1:
+            segment_end = self.segment_starts[1]
+        else:
+            segment_end = self.pos_memory
+
+        if self.pos_low >= segment_end:
+            self._remove_oldest_segment()
+
+    def __contains__(self, pos: int) -> bool:
+        """Checks whether the element is in the buffer."""
+        return self.pos_low <= pos < self.pos_next
+
+    def __len__(self) -> int:
+        """Number of elements in the buffer."""
+        return self.pos_next - self.pos_low
+
+    def __iter__(self) -> Iterator:
+        """Iterator over the positions in the buffer."""
+        return iter(range(self.pos_low, self.pos_next))
+
+    def __del__(self) -> None:
+        """Removes the remaining files."""
+        self.close()
+
+    def close(self) -> None:
+        """
+        Removes all spilled segments and releases the memory.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+
+        while self.segment_paths:
+            self._remove_oldest_segment()
+
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+        self.memory.clear()
+        self.cache.clear()
+
+    def _spill(self) -> None:
+        """
+        Writes the oldest in memory elements to a file as a segment.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+
+        start = self.pos_memory
+        elements = [
+            self.memory.pop(pos)
+            for pos in range(start, start + self.segment_size)
+        ]
+
+        fd, path = tempfile.mkstemp(prefix="teepot-", dir=self.directory)
+        with os.fdopen(fd, "wb") as fp:
+            self.serialiser.dump(elements, fp)
+
+        self.segment_starts.append(start)
+        self.segment_paths.append(path)
+        self.pos_memory = start + self.segment_size
+
+    def _load_segment(self, i_segment: int) -> Any:
+        """
+        Reads a whole segment back in one sequential read
+        (or takes it from the read ahead) and starts reading
+        the next segment ahead.
+
+        Parameters:
+            i_segment: int : index of the segment
+
+        Returns:
+            segment: Any : indexable elements of the segment
+        """
+
+        start = self.segment_starts[i_segment]
+
+        if start in self.cache:
+            self.cache.move_to_end(start)
+            return self.cache[start]
+
+        future = self.pending.pop(start, None)
+        if future is not None:
+            segment = future.result()
+        else:
+            segment = self._read_segment(self.segment_paths[i_segment])
+
+        self.cache[start] = segment
+        if len(self.cache) > self.n_cached:
+            self.cache.popitem(last=False)
+
+        if self.read_ahead and i_segment + 1 < len(self.segment_starts):
+            self._read_ahead(i_segment + 1)
+
+        return segment
+
+    def _read_segment(self, path: str) -> Any:
+        """
+        Deserialises a segment file.
+
+        Parameters:
+            path: str : path to the segment file
+
+        Returns:
+            segment: Any : indexable elements of the segment
+        """
+
+        with open(path, "rb") as fp:
+            return self.serialiser.load(fp)
+
+    def _read_ahead(self, i_segment: int) -> None:
+        """
+        Starts reading a segment in the background unless it is
+        cached or already being read.
+
+        Parameters:
+            i_segment: int : index of the segment
+
+        Returns:
+            None
+        """
+
+        start = self.segment_starts[i_segment]
+        if start in self.cache or start in self.pending:
+            return
+
+        if self.executor is None:
+            # deferred, most buffers are never read back
+            import concurrent.futures
+
+            self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+        self.pending[start] = self.executor.submit(
+            self._read_segment, self.segment_paths[i_segment]
+        )
+
+    def _remove_oldest_segment(self) -> None:
+        """
+        Deletes the file of the oldest segment.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+
+        start = self.segment_starts.pop(0)
+        path = self.segment_paths.pop(0)
+
+        self.cache.pop(start, None)
+
+        # the file must not be removed while it is being read
+        future = self.pending.pop(start, None)
+        if future is not None and not future.cancel():
+            future.exception()
+
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,316 @@
+"""
+Rate limiting of streams with a token bucket.
+"""
+
+import dataclasses
+import time
+import types
+
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    Generator,
+    Iterator
+)
+
+
+@dataclasses.dataclass
+class ThrottleStats:
+    """
+    Counters of a throttled stream to tell throttling apart
+    from a slow upstream.
+
+    Attributes:
+        n_released: int : number of elements released
+        n_waits: int : number of times the stream waited for tokens
+        time_throttled: float : time spent waiting for tokens
+        time_upstream: float : time spent waiting for the upstream
+    """
+
+    n_released: int = 0
+
+    n_waits: int = 0
+
+    time_throttled: float = 0.0
+
+    time_upstream: float = 0.0
+
+
+class TokenBucket:
+    """
+    Tokens accumulate at a constant rate up to the burst size.
+    Releasing an element costs a token.
+    """
+
+    def __init__(
+            self,
+            rate: float,
+            burst: int,
+            clock: Callable = time.monotonic
+        ) -> None:
+        """
+        Creates a full bucket.
+
+        Parameters:
+            rate: float : tokens per second
+            burst: int : capacity of the bucket
+            clock: Callable = time.monotonic : source of time
+
+        Returns:
+            None
+        """
+
+        if rate <= 0 or burst < 1:
+            raise ValueError("The rate must be positive and the burst at least 1.")
+
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+
+        self.tokens = float(burst)
+        self.time_last = clock()
+
+    def available(self) -> float:
+        """
+        Refills the bucket.
+
+        Parameters:
+            None
+
+        Returns:
+            tokens: float : number of tokens, negative if in debt
+        """
+
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.time_last) * self.rate)
+        self.time_last = now
+
+        return self.tokens
+
+    def delay(self, cost: float) -> float:
+        """
+        Time until a cost can be paid. Costs above the burst size
+        are paid when the bucket is full (the bucket goes into debt).
+
+        Parameters:
+            cost: float : number of tokens
+
+        Returns:
+            : float : seconds to wait
+        """
+
+        return max(min(cost, self.burst) - self.available(), 0) / self.rate
+
+    def consume(self, cost: float) -> None:
+        """
+        Takes tokens from the bucket.
+
+        Parameters:
+            cost: float : number of tokens
+
+        Returns:
+            None
+        """
+
+        self.available()
+        self.tokens -= cost
+
+
+def throttle(
+        iterator: Iterator,
+        rate: float,
+        burst: int,
+        stats: ThrottleStats = None,
+        clock: Callable = time.monotonic,
+        sleep: Callable = time.sleep
+    ) -> Generator:
+    """
+    Creates a generator which releases at most `rate` elements per second
+    on average and at most `burst` elements at once. It sleeps until
+    a full burst can be released, not before each element.
+
+    Parameters:
+        iterator: Iterator : iterator!
+        rate: float : elements per second
+        burst: int : number of elements released without waiting
+        stats: ThrottleStats = None : counters to update
+        clock: Callable = time.monotonic : source of time
+        sleep: Callable = time.sleep : waits for a number of seconds
+
+    Yields:
+        element: Any : element!
+    """
+
+    if stats is None:
+        stats = ThrottleStats()
+
+    bucket = TokenBucket(rate, burst, clock)
+    iterator = iter(iterator)
+
+    # elements left of the current burst
+    n_burst = 0
+
+    while True:
+        time_start = clock()
+        try:
+            element = next(iterator)
+        except StopIteration:
+            return
+        stats.time_upstream += clock() - time_start
+
+        if not n_burst:
+            _wait(bucket.delay(burst), stats, clock, sleep)
+            n_burst = burst
+
+        n_burst -= 1
+        bucket.consume(1)
+        stats.n_released += 1
+
+        yield element
+
+
+def throttle_batches(
+        batches: Iterator,
+        rate: float,
+        burst: int,
+        stats: ThrottleStats = None,
+        clock: Callable = time.monotonic,
+        sleep: Callable = time.sleep
+    ) -> Generator:
+    """
+    Creates a generator of batches, e.g. from `make_batcher`, which
+    releases at most `rate` elements per second on average.
+    A batch costs as many tokens as it has elements.
+
+    Parameters:
+        batches: Iterator : batches!
+        rate: float : elements per second
+        burst: int : number of elements released without waiting
+        stats: ThrottleStats = None : counters to update
+        clock: Callable = time.monotonic : source of time
+        sleep: Callable = time.sleep : waits for a number of seconds
+
+    Yields:
+        batch: Any : batch, generators are materialised to lists
+    """
+
+    if stats is None:
+        stats = ThrottleStats()
+
+    bucket = TokenBucket(rate, burst, clock)
+    batches = iter(batches)
+
+    while True:
+        time_start = clock()
+        try:
+            batch = next(batches)
+        except StopIteration:
+            return
+
+        if isinstance(batch, types.GeneratorType):
+            batch = list(batch)
+        stats.time_upstream += clock() - time_start
+
+        _wait(bucket.delay(len(batch)), stats, clock, sleep)
+
+        bucket.consume(len(batch))
+        stats.n_released += len(batch)
+
+        yield batch
+
+
+async def throttle_async(
+        iterator: Any,
+        rate: float,
+        burst: int,
+        stats: ThrottleStats = None,
+        clock: Callable = time.monotonic
+    ) -> AsyncGenerator:
+    """
+    Asynchronous counterpart of `throttle`.
+
+    Parameters:
+        iterator: Any : asynchronous or synchronous iterator
+        rate: float : elements per second
+        burst: int : number of elements released without waiting
+        stats: ThrottleStats = None : counters to update
+        clock: Callable = time.monotonic : source of time
+
+    Yields:
+        element: Any : element!
+    """
+
+    # deferred so that importing the package does not load asyncio
+    import asyncio
+
+    if stats is None:
+        stats = ThrottleStats()
+
+    bucket = TokenBucket(rate, burst, clock)
+
+    if hasattr(iterator, "__aiter__"):
+        iterator = iterator.__aiter__()
+        get_next = iterator.__anext__
+    else:
+        iterator = iter(iterator)
+
+        # StopIteration cannot propagate out of a coroutine
+        async def get_next():
+            try:
+                return next(iterator)
+            except StopIteration:
+                raise StopAsyncIteration from None
+
+    n_burst = 0
+
+    while True:
+        time_start = clock()
+        try:
+            element = await get_next()
+        except StopAsyncIteration:
+            return
+        stats.time_upstream += clock() - time_start
+
+        if not n_burst:
+            delay = bucket.delay(burst)
+            if delay > 0:
+                time_start = clock()
+                await asyncio.sleep(delay)
+                stats.time_throttled += clock() - time_start
+                stats.n_waits += 1
+            n_burst = burst
+
+        n_burst -= 1
+        bucket.consume(1)
+        stats.n_released += 1
+
+        yield element
+
+
+def _wait(
+        delay: float,
+        stats: ThrottleStats,
+        clock: Callable,
+        sleep: Callable
+    ) -> None:
+    """
+    Sleeps and records the time spent throttled.
+
+    Parameters:
+        delay: float : seconds to wait
+        stats: ThrottleStats : counters to update
+        clock: Callable : source of time
+        sleep: Callable : waits for a number of seconds
+
+    Returns:
+        None
+    """
+
+    if delay <= 0:
+        return
+
+    time_start = clock()
+    sleep(delay)
+    stats.time_throttled += clock() - time_start
+    stats.n_waits += 1
@@ -0,0 +1,318 @@
+"""
+Windowed aggregations over streams.
+"""
+
+import bisect
+import collections
+import math
+import operator
+
+from typing import (
+    Any,
+    Callable,
+    Generator,
+    Iterator
+)
+
+from .batches import (
+    make_batcher
+)
+
+
+def tumbling_aggregate(
+        iterator: Iterator,
+        n: int,
+        func: Callable
+    ) -> Generator:
+    """
+    Aggregates non-overlapping windows of the stream.
+
+    Parameters:
+        iterator: Iterator : iterator!
+        n: int : window size, the last window can be shorter
+        func: Callable : aggregate of a window e.g. sum, max
+            or statistics.fmean, called on the batch generator
+
+    Yields:
+        : Any : aggregate of a window
+    """
+
+    for batch in make_batcher(iterator, n, strict=False):
+        yield func(batch)
+
+
+def sliding_windows(
+        iterator: Iterator,
+        n: int,
+        step: int = 1
+    ) -> Generator:
+    """
+    Creates a generator of overlapping windows.
+
+    Parameters:
+        iterator: Iterator : iterator!
+        n: int : window size
+        step: int = 1 : number of elements between window starts
+
+    Yields:
+        window: Tuple[Any] : n consecutive elements
+    """
+
+    window = collections.deque(maxlen=n)
+
+    # number of elements to add before the next window is complete
+    n_until = n
+
+    for element in iterator:
+        window.append(element)
+        n_until -= 1
+
+        if n_until == 0:
+            yield tuple(window)
+            n_until = step
+
+
+def sliding_sum(iterator: Iterator, n: int) -> Generator:
+    """
+    Running sum over a sliding window. Updated in amortised O(1)
+    per element. The total is recomputed from the window every n
+    elements, so float rounding errors do not accumulate.
+
+    Parameters:
+        iterator: Iterator : iterator of numbers
+        n: int : window size
+
+    Yields:
+        total: Any : sum of the last n elements
+    """
+
+    window = collections.deque()
+    total = 0
+
+    # number of updates since the total was recomputed
+    n_update = 0
+
+    for element in iterator:
+        window.append(element)
+        total += element
+
+        if len(window) > n:
+            total -= window.popleft()
+
+        n_update += 1
+        if n_update == n:
+            total = sum(window)
+            n_update = 0
+
+        if len(window) == n:
+            yield total
+
+
+def sliding_mean(iterator: Iterator, n: int) -> Generator:
+    """
+    Running mean over a sliding window. Updated in amortised O(1) per element.
+
+    Parameters:
+        iterator: Iterator : iterator of numbers
+        n: int : window size
+
+    Yields:
+        mean: float : mean of the last n elements
+    """
+
+    for total in sliding_sum(iterator, n):
+        yield total / n
+
+
+def sliding_min(iterator: Iterator, n: int) -> Generator:
+    """
+    Running minimum over a sliding window. Amortised O(1) per element.
+
+    Parameters:
+        iterator: Iterator : iterator!
+        n: int : window size
+
+    Yields:
+        : Any : minimum of the last n elements
+    """
+
+    return _sliding_extremum(iterator, n, operator.ge)
+
+
+def sliding_max(iterator: Iterator, n: int) -> Generator:
+    """
+    Running maximum over a sliding window. Amortised O(1) per element.
+
+    Parameters:
+        iterator: Iterator : iterator!
+        n: int : window size
+
+    Yields:
+        : Any : maximum of the last n elements
+    """
+
+    return _sliding_extremum(iterator, n, operator.le)
+
+
+def _sliding_extremum(
+        iterator: Iterator,
+        n: int,
+        is_dominated: Callable
+    ) -> Generator:
+    """
+    Running extremum with a monotonic deque. The deque holds
+    the candidates in the window which can still become the extremum.
+
+    Parameters:
+        iterator: Iterator : iterator!
+        n: int : window size
+        is_dominated: Callable : whether a candidate (1st argument)
+            can be discarded due to a new element (2nd argument)
+
+    Yields:
+        : Any : extremum of the last n elements
+    """
+
+    # (index, element) pairs, the extremum is at the front
+    candidates = collections.deque()
+
+    for i, element in enumerate(iterator):
+
+        while candidates and is_dominated(candidates[-1][1], element):
+            candidates.pop()
+        candidates.append((i, element))
+
+        # the front has left the window
+        if candidates[0][0] <= i - n:
+            candidates.popleft()
+
+        if i >= n - 1:
+            yield candidates[0][1]
+
+
+def sliding_quantile(
+        iterator: Iterator,
+        n: int,
+        q: float
+    ) -> Generator:
+    """
+    Running quantile over a sliding window. The window is kept
+    sorted, an update is a binary search and a memory move.
+
+    Parameters:
+        iterator: Iterator : iterator of numbers
+        n: int : window size
+        q: float : quantile in [0, 1], linearly interpolated
+            as `numpy.quantile` does
+
+    Yields:
+        : float : q-th quantile of the last n elements
+    """
+
+    window = collections.deque()
+    ordered = []
+
+    # the quantile position in the sorted window
+    pos = q * (n - 1)
+    i_low = math.floor(pos)
+    i_high = min(i_low + 1, n - 1)
+    frac = pos - i_low
+
+    for element in iterator:
+        window.append(element)
+        bisect.insort(ordered, element)
+
+        if len(window) > n:
+            del ordered[bisect.bisect_left(ordered, window.popleft())]
+
+        if len(window) == n:
+            yield ordered[i_low] + (ordered[i_high] - ordered[i_low]) * frac
+
+
+def sliding_aggregate_array(
+        array: Any,
+        n: int,
+        how: str,
+        q: float = None
+    ) -> Any:
+    """
+    Sliding window aggregates of an array. Sums and means are
+    calculated from the cumulative sum (accumulated in float64
+    for floats), the other aggregates on a strided view without
+    copying the windows.
+
+    Parameters:
+        array: np.ndarray : 1D array
+        n: int : window size
+        how: str : "sum", "mean", "min", "max" or "quantile"
+        q: float = None : quantile in [0, 1] if `how` is "quantile"
+
+    Returns:
+        aggregates: np.ndarray : aggregate of each full window
+    """
+
+    import numpy as np
+
+    array = np.asarray(array)
+
+    if len(array) < n:
+        return array[:0]
+
+    if how in ("sum", "mean"):
+        # float32 cumulative sums lose the small differences
+        dtype = np.float64 if array.dtype.kind == "f" else None
+        cumsum = np.cumsum(array, dtype=dtype)
+        totals = cumsum[n - 1:].copy()
+        totals[1:] -= cumsum[:-n]
+
+        return totals / n if how == "mean" else totals
+
+    windows = np.lib.stride_tricks.sliding_window_view(array, n)
+
+    if how == "min":
+        return windows.min(axis=1)
+
+    if how == "max":
+        return windows.max(axis=1)
+
+    if how == "quantile":
+        return np.quantile(windows, q, axis=1)
+
+    raise ValueError(f"Unknown aggregate: {how}")
+
+
+def sliding_aggregate_chunks(
+        chunks: Iterator,
+        n: int,
+        how: str,
+        q: float = None
+    ) -> Generator:
+    """
+    Sliding window aggregates of a stream of array chunks
+    e.g. record batches. The windows span the chunk boundaries.
+
+    Parameters:
+        chunks: Iterator : iterator of 1D arrays
+        n: int : window size
+        how: str : "sum", "mean", "min", "max" or "quantile"
+        q: float = None : quantile in [0, 1] if `how` is "quantile"
+
+    Yields:
+        aggregates: np.ndarray : aggregates of the windows
+            ending in a chunk
+    """
+
+    import numpy as np
+
+    # last n - 1 elements of the previous chunks
+    tail = None
+
+    for chunk in chunks:
+        if tail is not None:
+            chunk = np.concatenate((tail, chunk))
+
+        aggregates = sliding_aggregate_array(chunk, n, how, q)
+        if len(aggregates):
+            yield aggregates
+
+        tail = chunk[max(len(chunk) - (n - 1), 0):] if n > 1 else chunk[:0]
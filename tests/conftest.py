@@ -0,0 +1,20 @@
+"""
+Shared fixtures of the tests.
+"""
+
+import random
+
+import pytest
+
+
+def pytest_configure(config):
+    """Registers the marker of the performance tests."""
+    config.addinivalue_line(
+        "markers", "perf: performance regression test against stored baselines"
+    )
+
+
+@pytest.fixture
+def rng():
+    """Seeded random generator => failures are reproducible."""
+    return random.Random(20261019)
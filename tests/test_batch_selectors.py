@@ -0,0 +1,96 @@
+"""
+Batch selectors against the reference elementwise implementation.
+"""
+
+import pytest
+
+from ..generators.batch_selectors import (
+    make_batch_selector_cond_count,
+    select_batches_cond_count_array
+)
+
+
+def reference_cond_count(iterator, cond_start, n, yield_start):
+    """
+    Elementwise condition and count selector as originally written.
+    """
+
+    def selector_function():
+        has_batch_started = False
+        i = 0
+        for element in iterator:
+            if not has_batch_started:
+                if cond_start(element):
+                    if yield_start:
+                        i += 1
+                        yield element
+                    has_batch_started = True
+            else:
+                i += 1
+                if i == n + 1:
+                    break
+                else:
+                    yield element
+
+    while True:
+        batch = list(selector_function())
+        if not batch:
+            return
+        yield batch
+
+
+def random_cases(rng, n_case=500):
+    """Random streams, batch sizes, start conditions and modes."""
+    for _ in range(n_case):
+        stream = [rng.randint(0, 9) for _ in range(rng.randint(0, 40))]
+        n = rng.randint(1, 6)
+        k = rng.randint(1, 5)
+        yield_start = rng.random() < 0.5
+        yield stream, n, k, yield_start
+
+
+def test_cond_count_matches_reference(rng):
+    for stream, n, k, yield_start in random_cases(rng):
+        cond = lambda x: x % k == 0
+
+        expected = list(reference_cond_count(iter(stream), cond, n, yield_start))
+        result = [
+            list(batch) for batch in
+            make_batch_selector_cond_count(iter(stream), cond, n, yield_start)
+        ]
+
+        assert result == expected, (stream, n, k, yield_start)
+
+
+def test_cond_count_array_matches_reference(rng):
+    np = pytest.importorskip("numpy")
+
+    for stream, n, k, yield_start in random_cases(rng):
+        expected = list(reference_cond_count(
+            iter(stream), lambda x: x % k == 0, n, yield_start
+        ))
+        result = [
+            batch.tolist() for batch in select_batches_cond_count_array(
+                np.array(stream, dtype=int), lambda x: x % k == 0, n, yield_start
+            )
+        ]
+
+        assert result == expected, (stream, n, k, yield_start)
+
+
+@pytest.mark.parametrize("yield_start", [True, False])
+def test_cond_count_edge_cases(yield_start):
+    cond = lambda x: x == 0
+
+    # empty input
+    assert list(make_batch_selector_cond_count(iter([]), cond, 3, yield_start)) == []
+
+    # start is never met
+    assert list(make_batch_selector_cond_count(iter([1, 2]), cond, 3, yield_start)) == []
+
+    # start is the last element
+    result = [
+        list(batch) for batch in
+        make_batch_selector_cond_count(iter([1, 0]), cond, 3, yield_start)
+    ]
+    assert result == ([[0]] if yield_start else [])
@@ -0,0 +1,122 @@
+"""
+Batchers: reference semantics and the batch level counterparts.
+"""
+
+import pytest
+
+from ..generators.batches import (
+    make_batcher,
+    serialiser
+)
+
+from ..generators.adaptive import (
+    AdaptiveBatcher,
+    AIMDController,
+    PIDController
+)
+
+
+def test_make_batcher_round_trip(rng):
+    for _ in range(200):
+        stream = list(range(rng.randint(0, 30)))
+        n = rng.randint(1, 7)
+
+        batches = [list(batch) for batch in make_batcher(iter(stream), n, strict=False)]
+
+        assert [x for batch in batches for x in batch] == stream
+        assert all(len(batch) == n for batch in batches[:-1])
+
+
+def test_make_batcher_strict_raises_on_short_batch():
+    with pytest.raises(ValueError):
+        for batch in make_batcher(iter(range(7)), 5, strict=True):
+            list(batch)
+
+
+def test_make_batcher_empty():
+    assert list(make_batcher(iter([]), 3)) == []
+
+
+def test_serialiser_inverts_batcher(rng):
+    stream = [rng.random() for _ in range(100)]
+    assert list(serialiser(make_batcher(iter(stream), 7, strict=False))) == stream
+
+
+def test_record_batches_match_batcher(rng):
+    np = pytest.importorskip("numpy")
+
+    from ..generators.record_batch import (
+        RecordBatch,
+        compressor_batches,
+        make_batcher_batches,
+        thinner_batches,
+        filtr_batches,
+        zipper_batches
+    )
+    from ..generators.basic import (
+        filtr,
+        thinner
+    )
+    from ..generators.multi_input import (
+        compressor,
+        zipper
+    )
+
+    for _ in range(100):
+        a = np.array([rng.randint(0, 99) for _ in range(50)])
+        rows = [(x,) for x in a.tolist()]
+        cuts = sorted(rng.sample(range(1, 50), 3))
+        batches = [RecordBatch({"a": chunk}) for chunk in np.split(a, cuts)]
+        n = rng.randint(1, 7)
+
+        result = [list(b.rows()) for b in make_batcher_batches(iter(batches), n, strict=False)]
+        assert result == [list(b) for b in make_batcher(iter(rows), n, strict=False)]
+
+        result = [r for b in thinner_batches(iter(batches), n) for r in b.rows()]
+        assert result == list(thinner(iter(rows), n))
+
+        result = [r for b in filtr_batches(iter(batches), lambda b: b["a"] > 50) for r in b.rows()]
+        assert result == list(filtr(iter(rows), lambda r: r[0] > 50))
+
+        masks = [np.array([rng.random() < 0.5 for _ in range(len(b))]) for b in batches]
+        result = [r for b in compressor_batches(iter(batches), iter(masks)) for r in b.rows()]
+        selector = iter(np.concatenate(masks).tolist())
+        assert result == list(compressor(iter(rows), selector))
+
+        others = [RecordBatch({"b": -b["a"]}) for b in batches]
+        result = [r for b in zipper_batches(iter(batches), iter(others)) for r in b.rows()]
+        bundles = zipper(iter(a.tolist()), iter((-a).tolist()))
+        assert result == [tuple(bundle) for bundle in bundles]
+
+
+def test_adaptive_batcher_keeps_order_and_bounds():
+    stream = list(range(1000))
+    batcher = AdaptiveBatcher(iter(stream), AIMDController(0.01, 2, 20, increase=3), 2)
+
+    result = []
+    for batch in batcher:
+        result.extend(batch)
+        batcher.report(0.001 * len(batch))
+
+    assert result == stream
+    assert all(2 <= n <= 20 for n in batcher.history[:-1])
+
+
+@pytest.mark.parametrize("controller, latency, n_target", [
+    # latency proportional to the size => n * 1 ms = 50 ms
+    (PIDController(0.05), lambda n: 0.001 * n, 50),
+    # fixed overhead => n / (10 ms + n * 1 ms) = 800 per second
+    (PIDController(800, "throughput"), lambda n: 0.01 + 0.001 * n, 40)
+])
+def test_pid_controller_converges(controller, latency, n_target):
+    batcher = AdaptiveBatcher(iter(range(100_000)), controller, 1)
+
+    for batch in batcher:
+        batcher.report(latency(len(batch)))
+
+    assert batcher.history[-10:-1] == [n_target] * 9
+
+
+def test_pid_controller_rejects_unknown_measure():
+    with pytest.raises(ValueError):
+        PIDController(1.0, "size")
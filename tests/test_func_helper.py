@@ -0,0 +1,59 @@
+"""
+Curried predicates.
+"""
+
+import functools
+import operator
+
+import pytest
+
+from ..util.func_helper import (
+    curry_2arg,
+    curry_right,
+    is_operator_predicate,
+    vectorise_predicate
+)
+
+
+OPERATORS = [
+    operator.lt, operator.le, operator.eq, operator.ne, operator.ge,
+    operator.gt, operator.add, operator.mul, operator.sub, operator.mod
+]
+
+
+@pytest.mark.parametrize("func", OPERATORS)
+def test_curry_2arg_matches_closure(func, rng):
+    for _ in range(100):
+        x, arg = rng.randint(-5, 5), rng.randint(1, 5)
+        assert curry_2arg(func, arg)(x) == func(x, arg)
+
+
+@pytest.mark.parametrize("func, x, arg", [
+    (operator.add, "a", "b"),
+    (operator.add, [1], [2]),
+    (operator.mul, [1], 2),
+    (operator.or_, {"a": 1}, {"a": 2})
+])
+def test_curry_2arg_keeps_operand_order(func, x, arg):
+    assert curry_2arg(func, arg)(x) == func(x, arg)
+
+
+def test_only_comparisons_are_predicates():
+    assert is_operator_predicate(curry_2arg(operator.le, 1))
+    assert not is_operator_predicate(curry_2arg(operator.add, 1))
+    assert not is_operator_predicate(functools.partial(operator.add, 1))
+
+
+def test_curry_right():
+    assert curry_right(pow, 2, 5)(3) == pow(3, 2, 5)
+
+
+def test_vectorise_predicate():
+    np = pytest.importorskip("numpy")
+
+    array = np.arange(-5, 6)
+    predicate = curry_2arg(operator.gt, 0)
+
+    assert is_operator_predicate(predicate)
+    assert vectorise_predicate(predicate)(array).tolist() == [x > 0 for x in array]
+    assert vectorise_predicate(lambda x: x > 0)(array).tolist() == [x > 0 for x in array]
@@ -0,0 +1,49 @@
+"""
+Import time regression: the light weight modules must not load numpy
+or the heavy standard library modules.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = os.path.basename(PACKAGE_DIR)
+
+
+def imported_modules(module: str):
+    """Modules imported by `import module` in a fresh interpreter."""
+
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(PACKAGE_DIR))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True, env=env
+    )
+
+    return {
+        line.split("|")[-1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+
+
+@pytest.mark.parametrize("subpackage", ["generators", "coroutines", "util"])
+def test_heavy_modules_are_not_imported(subpackage):
+    modules = imported_modules(f"{PACKAGE}.{subpackage}")
+
+    assert f"{PACKAGE}.{subpackage}" in modules
+    assert "numpy" not in modules
+    assert "asyncio" not in modules
+    assert "multiprocessing" not in modules
+
+
+def test_basic_combinators_load_no_siblings():
+    modules = imported_modules(f"{PACKAGE}.generators.basic")
+    prefix = f"{PACKAGE}.generators."
+
+    loaded = {module[len(prefix):] for module in modules if module.startswith(prefix)}
+
+    assert loaded == {"basic", "batches"}
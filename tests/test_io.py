@@ -0,0 +1,143 @@
+"""
+File sources, sinks and the batch format.
+"""
+
+import io
+import zlib
+
+import pytest
+
+from ..coroutines.file_coro import (
+    line_writer_coro
+)
+
+from ..generators.batch_format import (
+    FrameSerialiser,
+    batch_reader,
+    batch_writer,
+    read_batch,
+    write_batch
+)
+
+from ..generators.batches import (
+    make_batcher
+)
+
+from ..generators.file_io import (
+    line_iterator
+)
+
+
+def test_lines_round_trip(tmp_path, rng):
+    path = tmp_path / "lines.txt"
+    lines = [str(rng.random()) for _ in range(1000)]
+
+    writer = line_writer_coro(path, encoding="utf8", block_size=100)
+    for line in lines:
+        writer.send(line)
+    writer.close()
+
+    assert list(line_iterator(path, block_size=37, encoding="utf8")) == lines
+
+
+def test_records_round_trip(tmp_path):
+    np = pytest.importorskip("numpy")
+    from ..coroutines.file_coro import record_writer_coro
+    from ..generators.file_io import record_batches
+
+    dtype = np.dtype([("a", "<i4"), ("b", "<f8")])
+    records = np.zeros(10, dtype=dtype)
+    records["a"] = np.arange(10)
+
+    path = tmp_path / "records.bin"
+    writer = record_writer_coro(path)
+    writer.send(records[:4])
+    writer.send(records[4:])
+    writer.close()
+
+    batches = list(record_batches(path, dtype, 4))
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert np.concatenate(batches)["a"].tolist() == list(range(10))
+
+
+def test_record_batches_ignore_partial_record(tmp_path):
+    np = pytest.importorskip("numpy")
+    from ..generators.file_io import record_batches
+
+    path = tmp_path / "records.bin"
+    path.write_bytes(np.arange(5, dtype="<i4").tobytes() + b"xy")
+
+    batches = list(record_batches(path, "<i4", 2))
+    assert np.concatenate(batches).tolist() == [0, 1, 2, 3, 4]
+
+
+def test_record_memoryview_batches_are_iterable(tmp_path):
+    from ..generators.batches import serialiser
+    from ..generators.file_io import record_memoryview_batches
+
+    path = tmp_path / "records.bin"
+    records = [bytes([i]) * 3 for i in range(7)]
+    path.write_bytes(b"".join(records) + b"xy")
+
+    batches = record_memoryview_batches(path, 3, 3)
+    assert [bytes(record) for record in serialiser(batches)] == records
+
+
+@pytest.mark.parametrize("compression", [None, (zlib.compress, zlib.decompress)])
+def test_batch_format_round_trip(compression):
+    compress, decompress = compression or (None, None)
+
+    fp = io.BytesIO()
+    batches = list(batch_writer(make_batcher(iter(range(10)), 3, strict=False), fp, compress))
+    fp.seek(0)
+
+    assert list(batch_reader(fp, decompress)) == batches == [[0, 1, 2], [3, 4, 5], [6, 7, 8], [9]]
+
+
+def test_batch_format_keeps_none_batches():
+    fp = io.BytesIO()
+    for batch in ([1, 2], None, [3]):
+        write_batch(fp, batch)
+    fp.seek(0)
+
+    assert list(batch_reader(fp)) == [[1, 2], None, [3]]
+
+    fp.seek(0)
+    for batch in ([1, 2], None, [3]):
+        assert read_batch(fp) == batch
+    with pytest.raises(EOFError):
+        read_batch(fp)
+
+
+def test_batch_format_arrays():
+    np = pytest.importorskip("numpy")
+
+    fp = io.BytesIO()
+    arrays = [np.arange(10 ** 5), np.ones((3, 4), dtype="f4")]
+    list(batch_writer(iter(arrays), fp))
+    fp.seek(0)
+
+    for expected, result in zip(arrays, batch_reader(fp)):
+        assert result.dtype == expected.dtype
+        assert np.array_equal(result, expected)
+
+
+def test_frame_serialiser_spills_arrays(tmp_path):
+    np = pytest.importorskip("numpy")
+    from ..generators.spill_buffer import SpillBuffer
+
+    elements = [np.full(3, i) for i in range(40)]
+    buffer = SpillBuffer(
+        n_memory=4, segment_size=8, n_cached=1, directory=tmp_path,
+        serialiser=FrameSerialiser(zlib.compress, zlib.decompress)
+    )
+    for pos, element in enumerate(elements):
+        buffer[pos] = element
+
+    assert len(list(tmp_path.iterdir())) == 4
+    for pos in reversed(range(40)):
+        assert buffer[pos].tolist() == elements[pos].tolist()
+
+    for pos in range(40):
+        del buffer[pos]
+    assert list(tmp_path.iterdir()) == []
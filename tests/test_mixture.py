@@ -0,0 +1,170 @@
+"""
+Class mixture sampler.
+"""
+
+import collections
+import itertools
+import types
+
+import pytest
+
+from ..generators.samplers.mixture import (
+    class_sampler,
+    cycle_cached,
+    generate_sample_index_batches,
+    load_sample_plan,
+    make_sample_plan,
+    renormalise_counts
+)
+
+
+def test_samples_have_class_counts():
+    pytest.importorskip("numpy")
+
+    counts = (3, 1, 2)
+    iterators = tuple(iter([i] * 300) for i in range(3))
+
+    samples = [list(sample) for sample in class_sampler(iterators, counts)]
+    full = [sample for sample in samples if len(sample) == sum(counts)]
+
+    assert len(full) >= 99
+    for sample in full:
+        assert collections.Counter(sample) == {0: 3, 1: 1, 2: 2}
+
+
+def test_sampler_stops_at_exhausted_class():
+    pytest.importorskip("numpy")
+
+    iterators = (iter("a" * 100), iter("b" * 2))
+    n_b = sum(list(sample).count("b") for sample in class_sampler(iterators, (1, 1)))
+
+    assert n_b == 2
+
+
+def test_index_batches_are_permutations():
+    pytest.importorskip("numpy")
+
+    batches = generate_sample_index_batches((2, 0, 3))
+    for _ in range(50):
+        assert sorted(next(batches)) == [0, 0, 2, 2, 2]
+
+
+def test_sample_plan_rows_are_permutations_and_reproducible():
+    pytest.importorskip("numpy")
+
+    counts = (3, 1, 2)
+    plan = make_sample_plan(counts, 1000, seed=7, chunk_size=300)
+
+    assert plan.dtype.itemsize == 1
+    assert plan.shape == (1000, 6)
+    for row in plan.tolist():
+        assert sorted(row) == [0, 0, 0, 1, 2, 2]
+
+    assert (plan == make_sample_plan(counts, 1000, seed=7)).all()
+    # rows are not all the same permutation
+    assert len({tuple(row) for row in plan.tolist()}) > 1
+
+
+def test_sampler_replays_memory_mapped_plan(tmp_path):
+    pytest.importorskip("numpy")
+
+    counts = (2, 1)
+    path = str(tmp_path / "plan.npy")
+    make_sample_plan(counts, 50, seed=1, path=path)
+    plan = load_sample_plan(path)
+
+    iterators = tuple(iter([i] * 1000) for i in range(2))
+    samples = [list(sample) for sample in class_sampler(iterators, counts, plan)]
+
+    assert samples == plan.tolist()
+
+
+def test_renormalise_counts_keeps_sample_size():
+    assert renormalise_counts((3, 0, 2), 6) == [4, 0, 2]
+    assert sum(renormalise_counts((1, 1, 1), 4)) == 4
+    assert renormalise_counts((0, 0), 3) == [0, 0]
+
+
+def test_cycled_class_is_read_once_and_reshuffled(tmp_path):
+    np = pytest.importorskip("numpy")
+
+    n_read = []
+
+    def source():
+        for i in range(3):
+            n_read.append(i)
+            yield np.array([i, i])
+
+    for directory in (None, str(tmp_path)):
+        n_read.clear()
+        cycled = cycle_cached(source(), 0, directory)
+        elements = [next(cycled).tolist() for _ in range(30)]
+        cycled.close()
+
+        assert n_read == [0, 1, 2]
+        for start in range(0, 30, 3):
+            assert sorted(elements[start:start + 3]) == [[0, 0], [1, 1], [2, 2]]
+
+    assert not list(tmp_path.iterdir())
+
+
+def test_sampler_cycles_small_class():
+    pytest.importorskip("numpy")
+
+    iterators = (iter(range(300)), iter("xy"))
+    samples = class_sampler(iterators, (2, 1), exhausted="cycle", seed=0)
+
+    full = [list(sample) for sample in itertools.islice(samples, 100)]
+    small = collections.Counter(
+        element for sample in full for element in sample
+        if isinstance(element, str)
+    )
+
+    assert all(len(sample) == 3 for sample in full)
+    assert small == {"x": 50, "y": 50}
+
+
+def test_sampler_drops_exhausted_class():
+    pytest.importorskip("numpy")
+
+    for seed in range(50):
+        iterators = (iter("a" * 20), iter("b" * 3), iter("c" * 10))
+        samples = [
+            "".join(sample)
+            for sample in class_sampler(iterators, (2, 1, 1), exhausted="drop", seed=seed)
+        ]
+
+        # nothing is lost and the samples keep their size until the end
+        assert sorted("".join(samples)) == sorted("a" * 20 + "b" * 3 + "c" * 10)
+        assert all(len(sample) == 4 for sample in samples[:-1])
+        assert len(samples[-1]) <= 4
+
+    # after "b" runs out its slot goes to "a" (3 : 1 instead of 2 : 1 : 1)
+    assert collections.Counter(samples[4]) == {"a": 3, "c": 1}
+
+
+@pytest.mark.parametrize("exhausted", ["stop", "cycle", "drop"])
+def test_samples_are_generators_under_every_policy(exhausted):
+    pytest.importorskip("numpy")
+
+    iterators = (iter("a" * 4), iter("b" * 2))
+    samples = class_sampler(iterators, (2, 1), exhausted=exhausted, seed=0)
+
+    for sample in itertools.islice(samples, 3):
+        assert isinstance(sample, types.GeneratorType)
+        assert len(list(sample)) == 3
+
+
+def test_sampler_drops_exhausted_majority_class():
+    pytest.importorskip("numpy")
+
+    for seed in range(200):
+        iterators = (iter(range(5)), iter(range(1000, 1100)))
+        samples = [
+            list(sample)
+            for sample in class_sampler(iterators, (3, 1), exhausted="drop", seed=seed)
+        ]
+
+        assert sorted(sum(samples, [])) == list(range(5)) + list(range(1000, 1100))
+        assert all(len(sample) == 4 for sample in samples[:-1])
+        assert 0 < len(samples[-1]) <= 4
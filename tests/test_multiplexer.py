@@ -0,0 +1,191 @@
+"""
+Multiplexed generators and coroutines.
+"""
+
+import pytest
+
+from ..coroutines.multiplexer_coro import (
+    collector_coro,
+    filter_coro,
+    multiplex_coro
+)
+
+from ..generators.multiplexer import (
+    multiplexer
+)
+
+from ..generators.spill_buffer import (
+    ArraySerialiser,
+    PickleSerialiser,
+    SpillBuffer
+)
+
+
+def consume_interleaved(rng, cups, weights):
+    """Advances the cups in a random order until all are exhausted."""
+
+    outputs = [[] for _ in cups]
+    active = list(range(len(cups)))
+
+    while active:
+        i = rng.choices(active, [weights[j] for j in active])[0]
+        try:
+            outputs[i].append(next(cups[i]))
+        except StopIteration:
+            active.remove(i)
+
+    return outputs
+
+
+def test_multiplexer_copies_stream(rng):
+    for _ in range(100):
+        stream = list(range(rng.randint(0, 100)))
+        cups = multiplexer(iter(stream), 3)
+
+        outputs = consume_interleaved(rng, cups, [5, 1, 1])
+
+        assert all(output == stream for output in outputs)
+        assert len(cups[0].pot_manager.teepot.buffer) <= 1
+
+
+def test_multiplexer_spill_buffer(rng, tmp_path):
+    for _ in range(50):
+        stream = list(range(rng.randint(0, 200)))
+        buffer = SpillBuffer(n_memory=4, segment_size=5, directory=tmp_path)
+        cups = multiplexer(iter(stream), 3, buffer=buffer)
+
+        outputs = consume_interleaved(rng, cups, [10, 1, 1])
+
+        assert all(output == stream for output in outputs)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+class CountingSerialiser(PickleSerialiser):
+    """Counts the segments read back."""
+
+    def __init__(self):
+        self.n_load = 0
+
+    def load(self, fp):
+        self.n_load += 1
+        return super().load(fp)
+
+
+def test_spill_buffer_reads_next_segment_ahead(tmp_path):
+    serialiser = CountingSerialiser()
+    buffer = SpillBuffer(
+        n_memory=5, segment_size=10, serialiser=serialiser, directory=tmp_path
+    )
+    for pos in range(50):
+        buffer[pos] = pos
+
+    assert buffer[0] == 0
+    future = buffer.pending[10]
+    assert future.result() == list(range(10, 20))
+
+    # the read ahead segment is taken over, not read again
+    assert [buffer[pos] for pos in range(10, 20)] == list(range(10, 20))
+    assert buffer.pending[20].result() == list(range(20, 30))
+    assert serialiser.n_load == 3
+
+    for pos in range(50):
+        del buffer[pos]
+    buffer.close()
+
+    assert not buffer.pending
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_spill_buffer_array_serialiser(rng, tmp_path):
+    np = pytest.importorskip("numpy")
+
+    elements = [np.array([rng.random(), rng.random()]) for _ in range(100)]
+    buffer = SpillBuffer(
+        n_memory=8, segment_size=16, serialiser=ArraySerialiser(np.float64, (2,)),
+        n_cached=1, directory=tmp_path
+    )
+    for pos, element in enumerate(elements):
+        buffer[pos] = element
+
+    assert len(list(tmp_path.iterdir())) == 5
+    for pos in rng.sample(range(100), 100):
+        assert buffer[pos].tolist() == elements[pos].tolist()
+
+    buffer.close()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_single_consumer_does_not_buffer():
+    cup, = multiplexer(iter(range(100)), 1)
+    list(cup)
+
+    assert len(cup.pot_manager.teepot.buffer) == 0
+
+
+def test_closed_cup_releases_buffer_and_upstream():
+    closed = []
+
+    def source():
+        try:
+            yield from range(100)
+        finally:
+            closed.append(True)
+
+    fast, slow = multiplexer(source(), 2)
+    for _ in range(50):
+        next(fast)
+    assert len(fast.pot_manager.teepot.buffer) == 50
+
+    with slow:
+        pass
+    assert len(fast.pot_manager.teepot.buffer) == 0
+    assert list(slow) == []
+
+    fast.close()
+    assert closed == [True]
+
+
+def test_multiplex_coro_detaches_closed_targets():
+    buffer_all, buffer_even = [], []
+
+    collector = collector_coro(buffer_all)
+    filtered = filter_coro(lambda x: x % 2 == 0, collector_coro(buffer_even))
+    multiplexed = multiplex_coro([collector, filtered])
+
+    multiplexed.send(1)
+    collector.close()
+    multiplexed.send(2)
+
+    assert buffer_all == [1]
+    assert buffer_even == [2]
+
+
+def test_multiplex_coro_keeps_shared_targets_open():
+    buffer = []
+    shared = collector_coro(buffer)
+
+    first = multiplex_coro([shared])
+    second = multiplex_coro([shared])
+
+    first.send(1)
+    first.close()
+    second.send(2)
+
+    assert buffer == [1, 2]
+
+    multiplex_coro([shared], close_targets=True).close()
+    assert shared.gi_frame is None
+
+
+def test_multiplex_coro_sends_to_appended_targets():
+    buffer_first, buffer_second = [], []
+    targets = [collector_coro(buffer_first)]
+
+    multiplexed = multiplex_coro(targets)
+    multiplexed.send(1)
+    targets.append(collector_coro(buffer_second))
+    multiplexed.send(2)
+
+    assert buffer_first == [1, 2]
+    assert buffer_second == [2]
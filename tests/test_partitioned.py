@@ -0,0 +1,117 @@
+"""
+Partitioned execution in worker processes.
+"""
+
+import itertools
+import multiprocessing
+import os
+
+import pytest
+
+from ..generators.basic import (
+    filtr
+)
+
+from ..generators.partitioned import (
+    PartitionError,
+    partitioned_executor
+)
+
+
+# the sources and pipelines are module level so that they can be pickled
+
+def stride_source(partition):
+    """Every third number starting at the partition."""
+    return iter(range(partition, 60, 3))
+
+
+def is_even(x):
+    return x % 2 == 0
+
+
+def keep_even(iterator):
+    return filtr(iterator, is_even)
+
+
+def flaky_source(partition):
+    """Fails once at the 5th element, the marker file records the failure."""
+
+    marker, n = partition
+    for i in range(n):
+        if i == 5 and not os.path.exists(marker):
+            open(marker, "w").close()
+            raise RuntimeError("flaky")
+        yield i
+
+
+def failing_source(partition):
+    yield from range(3)
+    raise RuntimeError("broken")
+
+
+def endless_source(partition):
+    return itertools.count(partition)
+
+
+def reference_round_robin(iterators):
+    """Interlaces the iterators, skipping the exhausted ones."""
+
+    missing = object()
+    for elements in itertools.zip_longest(*iterators, fillvalue=missing):
+        yield from (element for element in elements if element is not missing)
+
+
+@pytest.mark.parametrize("merge", ["round_robin", "key", "unordered"])
+def test_merges_match_single_process(merge):
+    partitions = [0, 1, 2]
+    outputs = [list(keep_even(stride_source(p))) for p in partitions]
+
+    result = list(partitioned_executor(
+        partitions, stride_source, keep_even, merge=merge, chunk_size=4
+    ))
+
+    if merge == "round_robin":
+        assert result == list(reference_round_robin(outputs))
+    elif merge == "key":
+        assert result == sorted(sum(outputs, []))
+    else:
+        assert sorted(result) == sorted(sum(outputs, []))
+
+
+def test_retry_resumes_without_duplicates(tmp_path):
+    partitions = [(str(tmp_path / "a"), 20), (str(tmp_path / "b"), 12)]
+
+    result = list(partitioned_executor(
+        partitions, flaky_source, keep_even, max_retries=1, chunk_size=1
+    ))
+
+    assert os.path.exists(partitions[0][0])
+    assert result == list(reference_round_robin([
+        keep_even(range(20)), keep_even(range(12))
+    ]))
+
+
+def test_partition_error_after_retries():
+    with pytest.raises(PartitionError, match="after 2 retries"):
+        list(partitioned_executor([0], failing_source, keep_even, max_retries=2))
+
+
+def test_close_terminates_workers():
+    executor = partitioned_executor(
+        [0, 1], endless_source, keep_even, merge="unordered", chunk_size=8
+    )
+
+    assert len(list(itertools.islice(executor, 100))) == 100
+    assert len(multiprocessing.active_children()) == 2
+
+    executor.close()
+    assert not multiprocessing.active_children()
+
+
+def test_spawn_context():
+    result = list(partitioned_executor(
+        [0, 1], stride_source, keep_even, merge="key",
+        context=multiprocessing.get_context("spawn")
+    ))
+
+    assert result == sorted(keep_even(itertools.chain(range(0, 60, 3), range(1, 60, 3))))
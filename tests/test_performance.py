@@ -0,0 +1,121 @@
+"""
+Performance regression of the hot paths against stored baselines.
+
+Timings are normalised by a pure python calibration loop or by a
+reference path run on the same machine, the baselines are in
+`perf_baselines.json`. A test fails if a ratio exceeds its baseline
+by more than `TOLERANCE`.
+"""
+
+import itertools
+import json
+import os
+import timeit
+
+import pytest
+
+from ..generators.batch_selectors import (
+    make_batch_selector_cond_count,
+    select_batches_cond_count_array
+)
+
+from ..generators.multiplexer import (
+    multiplexer
+)
+
+from ..generators.batches import (
+    serialiser
+)
+
+from ..generators.samplers.mixture import (
+    class_sampler,
+    generate_sample_index_batches,
+    make_sample_plan
+)
+
+
+pytestmark = pytest.mark.perf
+
+TOLERANCE = 2.0
+
+with open(os.path.join(os.path.dirname(__file__), "perf_baselines.json")) as fp:
+    BASELINES = json.load(fp)
+
+
+def best_time(func, repeat=5):
+    """Minimum wall time of a function over repeats."""
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def calibration_time():
+    """Time of a fixed amount of interpreted work."""
+    return best_time(lambda: sum(i * i for i in range(200_000)))
+
+
+def check(name, value):
+    """Compares a measured ratio to its baseline."""
+    assert value <= BASELINES[name] * TOLERANCE, (name, value, BASELINES[name])
+
+
+def run_lagging_multiplexer(n_element, lag):
+    """One consumer runs `lag` elements ahead of the other."""
+
+    fast, slow = multiplexer(iter(range(n_element)), 2)
+    for _ in range(lag):
+        next(fast)
+    for _ in range(n_element - lag):
+        next(fast)
+        next(slow)
+
+
+def test_multiplexer_trimming_independent_of_lag():
+    n_element = 50_000
+
+    t_short = best_time(lambda: run_lagging_multiplexer(n_element, 10))
+    t_long = best_time(lambda: run_lagging_multiplexer(n_element, 10_000))
+
+    check("multiplexer_long_over_short_lag", t_long / t_short)
+
+
+def test_cond_count_array_path():
+    np = pytest.importorskip("numpy")
+
+    n_element, n = 200_000, 1000
+    array = np.arange(n_element)
+    cond = lambda x: x % (2 * n) == 0
+
+    t_iter = best_time(lambda: sum(
+        len(list(batch)) for batch in
+        make_batch_selector_cond_count(iter(range(n_element)), cond, n, True)
+    ))
+    t_array = best_time(lambda: sum(map(
+        len, select_batches_cond_count_array(array, cond, n, True)
+    )))
+
+    check("cond_count_array_over_iterator", t_array / t_iter)
+    check("cond_count_iterator_over_calibration", t_iter / calibration_time())
+
+
+def test_mixture_sampler():
+    pytest.importorskip("numpy")
+
+    counts = (8, 4, 4)
+    n_sample = 20_000 // counts[0]
+
+    def run(plan=None):
+        iterators = tuple(iter(range(20_000)) for _ in counts)
+        for sample in class_sampler(iterators, counts, plan):
+            list(sample)
+
+    # drawing the class indices dominates => compare with drawing them alone
+    def run_reference():
+        indices = serialiser(generate_sample_index_batches(counts))
+        for _ in itertools.islice(indices, n_sample * sum(counts)):
+            pass
+
+    t_sampler = best_time(run, 3)
+    check("mixture_sampler_over_index_generation", t_sampler / best_time(run_reference, 3))
+
+    # a replayed plan leaves the switching and batching overhead only
+    plan = make_sample_plan(counts, n_sample, seed=0)
+    check("mixture_plan_replay_over_calibration", best_time(lambda: run(plan), 3) / calibration_time())
@@ -0,0 +1,150 @@
+"""
+Printing sources with trimmed docstrings.
+"""
+
+import importlib
+import importlib.util
+import inspect
+import io
+import os
+
+import pytest
+
+from ..util import printer
+
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = sorted(
+    os.path.relpath(os.path.join(root, name), PACKAGE_DIR)[:-3].replace(os.sep, ".")
+    for subpackage in ("coroutines", "generators", "util")
+    for root, _, names in os.walk(os.path.join(PACKAGE_DIR, subpackage))
+    for name in names
+    if name.endswith(".py")
+)
+
+
+def reference_trim(lines):
+    """The original line based trimmer: docstrings open with a lone quote line."""
+
+    out, buffer = [], []
+    in_docstring = add_to_buffer = False
+
+    for line in lines:
+        line = line.rstrip()
+        token = line.strip()
+
+        if token == '"""' and not in_docstring:
+            in_docstring = add_to_buffer = True
+        elif in_docstring:
+            if token == '"""':
+                in_docstring = add_to_buffer = False
+            if token == "":
+                add_to_buffer = False
+
+        if add_to_buffer:
+            buffer.append(line)
+        else:
+            out.extend(buffer)
+            buffer = []
+
+        if not in_docstring:
+            out.append(line)
+
+    return out + buffer
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_trim_matches_line_based_trimmer(module):
+    module = importlib.import_module(f"..{module}", __package__)
+    lines = inspect.getsourcelines(module)[0]
+
+    trimmed = [line.rstrip() for line in printer._trim_docstrings(lines)]
+
+    assert trimmed == reference_trim(lines)
+
+
+def import_file(path, name):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_changed_file_refreshes_cache(tmp_path):
+    path = tmp_path / "printed.py"
+    path.write_text('def f():\n    """\n    Old.\n    """\n')
+    module = import_file(path, "printed")
+
+    assert "Old." in printer.format_source_with_trimmed_doc(module.f)
+
+    path.write_text('def f():\n    """\n    New.\n    """\n')
+    mtime = os.path.getmtime(path) + 10
+    os.utime(path, (mtime, mtime))
+
+    assert "New." in printer.format_source_with_trimmed_doc(module.f)
+    assert printer._source_cache[module.f.__code__][0] == mtime
+
+
+DIAMOND = '''
+def shared():
+    return 1
+
+
+def make_left(func):
+    def left():
+        return func()
+    return left
+
+
+def make_right(func):
+    def right():
+        return func()
+    return right
+
+
+def make_top(func_left, func_right):
+    def top():
+        return func_left() + func_right()
+    return top
+
+
+top = make_top(make_left(shared), make_right(shared))
+
+
+def make_wrapper(func):
+    def wrapper():
+        return func()
+    return wrapper
+
+
+def a():
+    return "a"
+
+
+def b():
+    return "b"
+
+
+def make_pair(func_a, func_b):
+    def pair():
+        return func_a() + func_b()
+    return pair
+
+
+# the wrappers share a code object, but enclose different functions
+pair = make_pair(make_wrapper(a), make_wrapper(b))
+'''
+
+
+def test_enclosed_functions_are_printed_once(tmp_path):
+    path = tmp_path / "diamond.py"
+    path.write_text(DIAMOND)
+    module = import_file(path, "diamond")
+
+    stream = io.StringIO()
+    printer.print_source_with_trimmed_doc(module.top, stream)
+    assert stream.getvalue().count("def shared") == 1
+
+    formatted = printer.format_source_with_trimmed_doc(module.pair)
+    assert "def a" in formatted and "def b" in formatted
@@ -0,0 +1,214 @@
+"""
+Deduplication, grouping, scheduling and sketches.
+"""
+
+import asyncio
+import collections
+
+import pytest
+
+from ..generators.distinct import (
+    distinct,
+    distinct_approximate
+)
+
+from ..generators.group_by import (
+    make_keyed_batcher
+)
+
+from ..generators.multi_input import (
+    EMPTY,
+    merger,
+    scheduled_merger
+)
+
+from ..generators.batches import (
+    make_batcher
+)
+
+from ..generators.sketches import (
+    CountMinSketch,
+    HyperLogLog,
+    KLLSketch,
+    hash_chunk,
+    hash_element
+)
+
+from ..generators.throttle import (
+    ThrottleStats,
+    throttle,
+    throttle_async,
+    throttle_batches
+)
+
+
+def test_distinct_exact(rng):
+    stream = [rng.randint(0, 50) for _ in range(1000)]
+    assert list(distinct(iter(stream))) == list(dict.fromkeys(stream))
+
+
+def test_distinct_bounded_forgets(rng):
+    assert list(distinct(iter([1, 2, 3, 1]), max_size=2)) == [1, 2, 3, 1]
+
+
+def test_distinct_approximate_has_no_false_negatives(rng):
+    stream = [rng.randint(0, 500) for _ in range(5000)]
+    result = list(distinct_approximate(iter(stream), capacity=1000))
+
+    assert len(result) == len(set(result))
+    assert set(result) <= set(stream)
+
+
+def test_distinct_array_chunks(rng):
+    np = pytest.importorskip("numpy")
+    from ..generators.distinct import distinct_array_chunks
+
+    array = np.array([rng.randint(0, 10 ** 4) for _ in range(20000)])
+    result = np.concatenate(list(
+        distinct_array_chunks(iter(np.array_split(array, 7)), capacity=20000)
+    ))
+
+    assert len(np.unique(result)) == len(result)
+    # false positives drop unique elements at the error rate
+    assert len(result) >= 0.99 * len(np.unique(array))
+
+
+def test_keyed_batcher_partitions_stream(rng):
+    stream = [(rng.randint(0, 9), i) for i in range(500)]
+
+    for kwargs in ({"n": 4}, {"max_groups": 3}, {"cond_end": lambda e: e[1] % 7 == 0}):
+        batches = list(make_keyed_batcher(iter(stream), lambda e: e[0], **kwargs))
+
+        assert sorted(e for _, batch in batches for e in batch) == sorted(stream)
+        assert all(e[0] == key for key, batch in batches for e in batch)
+        if "n" in kwargs:
+            assert all(len(batch) <= 4 for _, batch in batches)
+
+
+def test_scheduled_merger_without_weights_matches_merger():
+    iterators = [iter("aaa"), iter("bbb"), iter("ccc")]
+    assert list(scheduled_merger(iterators)) == list(merger(iter("aaa"), iter("bbb"), iter("ccc")))
+
+
+def test_scheduled_merger_weights_and_exhaustion():
+    result = list(scheduled_merger([iter("a" * 300), iter("b" * 50)], weights=[3, 1]))
+
+    assert collections.Counter(result) == {"a": 300, "b": 50}
+    assert collections.Counter(result[:100])["a"] == 75
+
+
+def test_scheduled_merger_polls_empty_sources():
+    def non_blocking():
+        for x in "xyz":
+            yield EMPTY
+            yield x
+
+    result = list(scheduled_merger([non_blocking(), iter("ab")], on_idle=lambda: None))
+    assert sorted(result) == sorted("xyzab")
+
+
+class FakeClock:
+    """Time which only advances when slept."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, delay):
+        self.now += delay
+
+
+def test_throttle_keeps_rate_and_sleeps_per_burst():
+    clock = FakeClock()
+    stats = ThrottleStats()
+
+    out = list(throttle(range(1000), 100, 10, stats, clock, clock.sleep))
+
+    assert out == list(range(1000))
+    # the first burst is free, the rest arrives at the rate
+    assert clock.now == pytest.approx(9.9)
+    assert stats.n_released == 1000
+    assert stats.n_waits <= 100
+    assert stats.time_throttled == pytest.approx(clock.now)
+
+
+def test_throttle_batches_charges_batch_length():
+    clock = FakeClock()
+    stats = ThrottleStats()
+
+    batches = make_batcher(iter(range(1000)), 25, strict=False)
+    out = list(throttle_batches(batches, 100, 50, stats, clock, clock.sleep))
+
+    assert [x for batch in out for x in batch] == list(range(1000))
+    assert clock.now == pytest.approx(9.5)
+    assert stats.n_waits == len(out) - 2
+
+
+def test_throttle_async_accepts_sync_and_async_sources():
+    async def source():
+        for i in range(50):
+            yield i
+
+    async def collect(iterator):
+        return [x async for x in throttle_async(iterator, 1e6, 10)]
+
+    assert asyncio.run(collect(range(50))) == list(range(50))
+    assert asyncio.run(collect(source())) == list(range(50))
+
+
+def test_count_min_sketch(rng):
+    stream = [int(rng.paretovariate(1.2)) for _ in range(20000)]
+    sketch = CountMinSketch(0.001, 0.01)
+    for x in stream:
+        sketch.update(x)
+
+    counts = collections.Counter(stream)
+    for x, count in counts.most_common(20):
+        assert count <= sketch.estimate(x) <= count + 0.001 * len(stream)
+
+
+def test_hyperloglog_merge(rng):
+    a, b = HyperLogLog(12), HyperLogLog(12)
+    for x in range(20000):
+        (a if x % 2 else b).update(x)
+
+    assert a.merge(b).estimate() == pytest.approx(20000, rel=0.05)
+
+
+def test_kll_quantiles(rng):
+    stream = [rng.random() for _ in range(50000)]
+    sketch = KLLSketch(200, seed=1)
+    for x in stream:
+        sketch.update(x)
+
+    assert sketch.n == len(stream)
+    for q in (0.1, 0.5, 0.9):
+        assert sketch.quantile(q) == pytest.approx(q, abs=0.02)
+
+
+def test_vectorised_sketch_updates_match_scalar(rng):
+    np = pytest.importorskip("numpy")
+
+    array = np.array([rng.randint(-10 ** 9, 10 ** 9) for _ in range(5000)])
+
+    for cls, args in ((CountMinSketch, (0.01, 0.1)), (HyperLogLog, (10,))):
+        scalar, vectorised = cls(*args), cls(*args)
+        for x in array.tolist():
+            scalar.update(x)
+        vectorised.update_many(array)
+
+        state = "table" if cls is CountMinSketch else "registers"
+        assert getattr(scalar, state) == getattr(vectorised, state)
+
+
+def test_uint64_hashes_match_scalar(rng):
+    np = pytest.importorskip("numpy")
+
+    values = [0, 1, 2 ** 63 - 1, 2 ** 63, 2 ** 64 - 1]
+    values += [rng.randrange(2 ** 63, 2 ** 64) for _ in range(100)]
+
+    hashes = hash_chunk(np.array(values, dtype=np.uint64)).tolist()
+
+    assert hashes == [hash_element(value) for value in values]
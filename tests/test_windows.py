@@ -0,0 +1,110 @@
+"""
+Windowed aggregates against recomputing each window.
+"""
+
+import pytest
+
+from ..generators.windows import (
+    sliding_aggregate_array,
+    sliding_aggregate_chunks,
+    sliding_max,
+    sliding_mean,
+    sliding_min,
+    sliding_quantile,
+    sliding_sum,
+    sliding_windows,
+    tumbling_aggregate
+)
+
+
+def random_windows(rng, n_case=300):
+    """Random streams and window sizes with the brute force windows."""
+    for _ in range(n_case):
+        stream = [rng.randint(0, 20) for _ in range(rng.randint(0, 40))]
+        n = rng.randint(1, 8)
+        windows = [stream[i:i + n] for i in range(len(stream) - n + 1)]
+        yield stream, n, windows
+
+
+def test_sliding_aggregates(rng):
+    for stream, n, windows in random_windows(rng):
+        assert list(sliding_sum(iter(stream), n)) == [sum(w) for w in windows]
+        assert list(sliding_mean(iter(stream), n)) == pytest.approx([sum(w) / n for w in windows])
+        assert list(sliding_min(iter(stream), n)) == [min(w) for w in windows]
+        assert list(sliding_max(iter(stream), n)) == [max(w) for w in windows]
+        assert list(sliding_windows(iter(stream), n)) == [tuple(w) for w in windows]
+
+
+def test_sliding_quantile(rng):
+    np = pytest.importorskip("numpy")
+
+    for stream, n, windows in random_windows(rng):
+        q = rng.random()
+        result = list(sliding_quantile(iter(stream), n, q))
+        assert result == pytest.approx([np.quantile(w, q) for w in windows])
+
+
+@pytest.mark.parametrize("how", ["sum", "mean", "min", "max", "quantile"])
+def test_chunked_aggregates_match_array(how, rng):
+    np = pytest.importorskip("numpy")
+
+    for stream, n, windows in random_windows(rng, 100):
+        array = np.array(stream, dtype=float)
+        expected = sliding_aggregate_array(array, n, how, 0.3)
+
+        cuts = sorted(rng.sample(range(len(stream) + 1), min(3, len(stream) + 1)))
+        chunks = np.split(array, cuts)
+        result = list(sliding_aggregate_chunks(iter(chunks), n, how, 0.3))
+        result = np.concatenate(result) if result else np.array([])
+
+        assert result == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float64"])
+def test_array_aggregates_match_elementwise(dtype, rng):
+    np = pytest.importorskip("numpy")
+
+    references = {
+        "sum": sliding_sum,
+        "mean": sliding_mean,
+        "min": sliding_min,
+        "max": sliding_max,
+        "quantile": lambda iterator, n: sliding_quantile(iterator, n, 0.3)
+    }
+
+    for _ in range(20):
+        array = np.array(
+            [rng.uniform(-1000, 1000) for _ in range(rng.randint(0, 2000))], dtype=dtype
+        )
+        n = rng.randint(1, 50)
+
+        for how, reference in references.items():
+            # the references work on python floats i.e. in float64,
+            # the quantiles are interpolated in the precision of the array
+            expected = list(reference(iter(array.tolist()), n))
+            result = sliding_aggregate_array(array, n, how, 0.3)
+            tolerance = 4000 * np.finfo(dtype).eps if how == "quantile" else 1e-6
+
+            assert result.tolist() == pytest.approx(expected, rel=1e-9, abs=tolerance)
+
+
+def test_sliding_sum_does_not_accumulate_rounding_errors():
+    stream = [1e16, 1.0, -1e16] + [1.0] * 20
+
+    assert list(sliding_sum(iter(stream), 3))[-10:] == [3.0] * 10
+
+
+@pytest.mark.parametrize("how", ["sum", "mean"])
+def test_float32_sums_are_accumulated_in_float64(how):
+    np = pytest.importorskip("numpy")
+
+    array = np.random.default_rng(0).uniform(0, 1000, 1_000_000).astype(np.float32)
+    windows = np.lib.stride_tricks.sliding_window_view(array.astype(np.float64), 10)
+    expected = windows.sum(axis=1) / (10 if how == "mean" else 1)
+
+    result = sliding_aggregate_array(array, 10, how)
+    assert np.abs(result - expected).max() < 1e-6 * (10 if how == "sum" else 1)
+
+
+def test_tumbling_aggregate():
+    assert list(tumbling_aggregate(iter(range(10)), 3, sum)) == [3, 12, 21, 9]
@@ -0,0 +1,11 @@
+"""
+Utilities.
+"""
+
+from .func_helper import (
+    curry,
+    curry_2arg,
+    curry_right,
+    is_operator_predicate,
+    vectorise_predicate
+)
@@ -2,11 +2,32 @@
 Misc function helpers.
 """
 
+import functools
+import operator
+
 from typing import (
     Any,
     Callable
 )
 
+
+# comparisons and their counterparts with swapped arguments
+# f(x, arg) == f_reflected(arg, x)
+# arithmetic operators are left out: `arg + x` is not `x + arg`
+# for e.g. strings and lists
+_REFLECTED = {
+    operator.lt: operator.gt,
+    operator.le: operator.ge,
+    operator.eq: operator.eq,
+    operator.ne: operator.ne,
+    operator.ge: operator.le,
+    operator.gt: operator.lt
+}
+
+# reflected comparisons, i.e. what `curry_2arg` binds
+_COMPARISONS = frozenset(_REFLECTED.values())
+
+
 def curry_2arg(func: Callable, arg: Any) -> Callable:
     """
     Enable a binary function to have its arguments passed in two calls.
@@ -19,6 +40,11 @@ def curry_2arg(func: Callable, arg: Any) -> Callable:
         inner: Callable : function with its 1st argument only
     """
 
+    # bind the operand with the reflected operator
+    # => no python frame per call
+    if func in _REFLECTED:
+        return functools.partial(_REFLECTED[func], arg)
+
     def inner(x: Callable) -> Any:
         """
         Calls the function with its 1st argument passed explicitly.
@@ -31,3 +57,104 @@ def curry_2arg(func: Callable, arg: Any) -> Callable:
         """
         return func(x, arg)
     return inner
+
+
+def curry(func: Callable, *args, **kwargs) -> Callable:
+    """
+    Binds the leading positional and the keyword arguments of a function.
+
+    Parameters:
+        func: Callable : function
+        *args : leading positional arguments
+        **kwargs : keyword arguments
+
+    Returns:
+        curried: Callable : function of the remaining arguments
+    """
+
+    return functools.partial(func, *args, **kwargs)
+
+
+def curry_right(func: Callable, *args) -> Callable:
+    """
+    Binds the trailing positional arguments of a function.
+
+    Parameters:
+        func: Callable : function
+        *args : trailing positional arguments
+
+    Returns:
+        curried: Callable : function of the leading arguments
+    """
+
+    if len(args) == 1:
+        return curry_2arg(func, args[0])
+
+    def inner(*args_leading) -> Any:
+        """
+        Calls the function with its leading arguments.
+
+        Parameters:
+            *args_leading : leading positional arguments
+
+        Returns:
+            : Any : function result
+        """
+        return func(*args_leading, *args)
+    return inner
+
+
+def is_operator_predicate(func: Callable) -> bool:
+    """
+    Checks whether a unary function is a comparison with a bound operand
+    e.g. `curry_2arg(operator.gt, 0)`. These return boolean masks
+    when called on a numpy array.
+
+    Parameters:
+        func: Callable : unary function
+
+    Returns:
+        : bool : whether it is a comparison with a bound operand
+    """
+
+    return (
+        isinstance(func, functools.partial)
+        and func.func in _COMPARISONS
+        and len(func.args) == 1
+        and not func.keywords
+    )
+
+
+def vectorise_predicate(func: Callable) -> Callable:
+    """
+    Makes a predicate which returns a boolean mask of an array.
+    Bound operators are turned to numpy comparisons, other
+    predicates are called elementwise.
+
+    Parameters:
+        func: Callable : unary boolean function called on an element
+
+    Returns:
+        vectorised: Callable : unary function called on an array
+    """
+
+    # comparisons of arrays are already elementwise
+    if is_operator_predicate(func):
+        return func
+
+    import numpy as np
+
+    ufunc = np.frompyfunc(func, 1, 1)
+
+    def vectorised(array: Any) -> Any:
+        """
+        Calls the predicate on each element of the array.
+
+        Parameters:
+            array: np.ndarray : array!
+
+        Returns:
+            : np.ndarray : boolean mask
+        """
+        return ufunc(array).astype(bool)
+    return vectorised
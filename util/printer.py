@@ -2,79 +2,191 @@
 Printing utilities.
 """
 
+import ast
 import inspect
+import linecache
+import os
+import sys
+import textwrap
+
 from typing import (
-    Any
+    Any,
+    Dict,
+    List,
+    Set,
+    TextIO,
+    Tuple
 )
 
 
-def print_source_with_trimmed_doc(obj: Any) -> None:
+# trimmed sources keyed by code object (or the object itself)
+# along with the modification time of the source file
+_source_cache: Dict[Any, Tuple[float, str]] = {}
+
+
+def print_source_with_trimmed_doc(obj: Any, stream: TextIO = None) -> None:
+    """
+    Prints the source of an object with only keeping the
+    first paragraph of the docstrings. The source of
+    enclosed functions is printed for decorators.
+
+    Parameters:
+        obj: Any : an object
+        stream: TextIO = None : where to write, defaults to stdout
+
+    Returns:
+        None : writes the source to the stream
     """
-    
+
+    if stream is None:
+        stream = sys.stdout
+
+    stream.write(format_source_with_trimmed_doc(obj))
+
+
+def format_source_with_trimmed_doc(obj: Any) -> str:
     """
+    Formats the source of an object with only keeping the
+    first paragraph of the docstrings as a markdown code block.
+    Decorators are replaced by the functions they enclose.
 
-    # is it a function?
-    if inspect.isfunction(obj):
+    Parameters:
+        obj: Any : an object
 
-        # if, so is thiit a decorator?
-        nonlocals = inspect.getclosurevars(obj).nonlocals
+    Returns:
+        formatted: str : source code block(s)
+    """
 
-        # if so, print all enclosed functions
-        # @TODO make it recursive
-        if nonlocals:
-            for field in nonlocals.values():
-                if inspect.isfunction(field):
-                    _print_source_with_trimmed_doc(field)
-            return
+    objs = []
+    _collect_enclosed_functions(obj, objs, set())
 
-    # if not a decorator or a function print the object source only
-    _print_source_with_trimmed_doc(obj)
+    return "".join(_get_trimmed_source(obj_) for obj_ in objs)
 
 
-def _print_source_with_trimmed_doc(
-        obj: Any
+def _collect_enclosed_functions(
+        obj: Any,
+        objs: List[Any],
+        seen: Set[Any]
     ) -> None:
     """
-    Prints the source lines of an object with only keeping
-    the first line of the docstrings.
+    Walks the closures of decorators recursively and collects the
+    innermost functions. Each function is visited once.
 
     Parameters:
         obj: Any : an object
+        objs: List[Any] : objects whose source is to be printed
+        seen: Set[Any] : visited functions (not code objects: closures
+            made by the same decorator share the code)
 
     Returns:
-        None : prints the source line to stdout
+        None : appends to `objs`
     """
+
+    if not inspect.isfunction(obj):
+        objs.append(obj)
+        return
+
+    if obj in seen:
+        return
+    seen.add(obj)
+
+    # is it a decorator i.e. does it enclose functions?
+    enclosed = [
+        field for field in inspect.getclosurevars(obj).nonlocals.values()
+        if inspect.isfunction(field)
+    ]
+
+    if not enclosed:
+        objs.append(obj)
+        return
+
+    for field in enclosed:
+        _collect_enclosed_functions(field, objs, seen)
+
+
+def _get_trimmed_source(obj: Any) -> str:
+    """
+    Retrieves the trimmed source of an object from the cache
+    or creates it if the source file has changed.
+
+    Parameters:
+        obj: Any : an object
+
+    Returns:
+        trimmed: str : source code block
+    """
+
+    key = getattr(obj, "__code__", obj)
+
+    try:
+        filename = inspect.getsourcefile(obj)
+        mtime = os.path.getmtime(filename)
+    except (TypeError, OSError):
+        filename, mtime = None, None
+
+    cached = _source_cache.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    # make sure the lines are reread when the file has changed
+    if filename is not None:
+        linecache.checkcache(filename)
+
     lines = inspect.getsourcelines(obj)[0]
-    
-    in_docstring = False
-    add_to_buffer = False
-
-    buffer = ["```python"]
-    for line in lines:
-        line = line.rstrip()
-
-        token = line.strip()
-
-        if (token == '"""') and not in_docstring:
-            in_docstring = True
-            add_to_buffer = True
-        else:
-
-            if in_docstring:
-                if token == '"""':
-                    in_docstring = False
-                    add_to_buffer = False
-                if token == "":
-                    add_to_buffer = False
-
-        if add_to_buffer:
-            buffer.append(line)
-        else:
-            for lb in buffer:
-                print(lb)
-            buffer = []
-
-        if not in_docstring:
-            print(line)
-
-    print("```")
+    trimmed = "".join(line.rstrip() + "\n" for line in _trim_docstrings(lines))
+    trimmed = "```python\n" + trimmed + "```\n"
+
+    _source_cache[key] = (mtime, trimmed)
+
+    return trimmed
+
+
+def _trim_docstrings(lines: List[str]) -> List[str]:
+    """
+    Removes the lines of docstrings after their first paragraph.
+    The closing line of the docstring is kept.
+
+    Parameters:
+        lines: List[str] : source lines
+
+    Returns:
+        trimmed: List[str] : source lines without the
+            trailing paragraphs of the docstrings
+    """
+
+    try:
+        tree = ast.parse(textwrap.dedent("".join(lines)))
+    except SyntaxError:
+        # e.g. a lambda in the middle of an expression
+        return lines
+
+    to_remove = set()
+
+    for node in ast.walk(tree):
+        if not isinstance(
+                node,
+                (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+            ):
+            continue
+
+        if not node.body:
+            continue
+
+        first = node.body[0]
+        if not (
+                isinstance(first, ast.Expr)
+                and isinstance(first.value, ast.Constant)
+                and isinstance(first.value.value, str)
+            ):
+            continue
+
+        # 0-based line indices of the opening and closing quotes
+        i_start = first.lineno - 1
+        i_end = first.end_lineno - 1
+
+        for i in range(i_start + 1, i_end):
+            if not lines[i].strip():
+                to_remove.update(range(i, i_end))
+                break
+
+    return [line for i, line in enumerate(lines) if i not in to_remove]